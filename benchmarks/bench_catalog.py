@@ -0,0 +1,41 @@
+"""
+Catalog load benchmark: dishes.xlsx (pandas + iterrows + json.loads) vs the SQLite store vs the Parquet snapshot
+
+    python -m benchmarks.bench_catalog --sizes 1000,10000,100000
+"""
+
+import argparse, tempfile, time
+from pathlib import Path
+from src.io_xls import read_dishes_xlsx, write_dishes_xlsx
+from src.catalog import read_catalog, write_catalog
+from src.dish_store import DishStore
+from .synthetic import make_dishes
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser("bench_catalog")
+    ap.add_argument("--sizes", default="1000,10000,100000")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'dishes':>8} {'xlsx s':>9} {'sqlite s':>9} {'parquet s':>10} {'speedup':>8} {'xlsx MB':>8} {'pq MB':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in [int(x) for x in args.sizes.split(",")]:
+            dishes = make_dishes(n)
+            xlsx = Path(tmp) / f"dishes_{n}.xlsx"; pq = Path(tmp) / f"dishes_{n}.parquet"
+            write_dishes_xlsx(str(xlsx), dishes); write_catalog(pq, dishes)
+            store = DishStore(Path(tmp) / f"dishes_{n}.db"); store.add_dishes(dishes)
+            assert len(read_catalog(pq)) == n == store.count()
+            t_x = _best(lambda: read_dishes_xlsx(str(xlsx)), 1 if n >= 50000 else args.repeat)
+            t_s = _best(store.all_dishes, args.repeat); store.close()
+            t_p = _best(lambda: read_catalog(pq), args.repeat)
+            print(f"{n:>8} {t_x:>9.3f} {t_s:>9.3f} {t_p:>10.3f} {t_x/t_p:>7.1f}x "
+                  f"{xlsx.stat().st_size/1e6:>8.1f} {pq.stat().st_size/1e6:>7.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Year-long rotation planning: one in-memory pass with a single history write vs saving after every day
+
+    python -m benchmarks.bench_horizon --dishes 10000 --days 365
+
+Categories are bound to a synthetic catalog, so each one rotates over hundreds of dishes.
+"""
+
+import argparse, tempfile, time
+from collections import Counter
+from datetime import datetime, timedelta
+from src.compact_catalog import CompactCatalog
+from src.tag_index import TagIndex
+from src.meal_rotation import MealRotationManager, generate_horizon_plan, MIN_REPEAT_GAPS
+from .synthetic import make_dishes
+
+def make_manager(data_dir, catalog, index) -> MealRotationManager:
+    m = MealRotationManager(data_dir, use_catalog=False)
+    if catalog is not None: m.bind_catalog(catalog, index)
+    return m
+
+def main():
+    ap = argparse.ArgumentParser("bench_horizon")
+    ap.add_argument("--dishes", type=int, default=10000)
+    ap.add_argument("--days", type=int, default=365)
+    args = ap.parse_args()
+
+    catalog = CompactCatalog.from_dishes(make_dishes(args.dishes)) if args.dishes else None
+    index = TagIndex.build(catalog) if catalog is not None else None
+    start = datetime(2026, 1, 1)
+    festivals = {datetime(2026, 1, 14): "Makar Sankranti", datetime(2026, 3, 4): "Holi", datetime(2026, 11, 8): "Diwali"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        m = make_manager(f"{tmp}/a", catalog, index)
+        t0 = time.perf_counter()
+        plans = generate_horizon_plan(start, args.days, festival_days=festivals, manager=m)
+        t_batch = time.perf_counter() - t0
+
+        m2 = make_manager(f"{tmp}/b", catalog, index)
+        m2.min_gaps = dict(MIN_REPEAT_GAPS)
+        t0 = time.perf_counter()
+        for k in range(args.days):
+            m2.generate_daily_plan(start + timedelta(days=k))
+        t_daily = time.perf_counter() - t0
+
+    served = Counter((it['category'], it['name']) for p in plans for meal in p['meals'].values()
+                     for it in meal.values() if isinstance(it, dict) and it.get('category') in MIN_REPEAT_GAPS)
+    per_cat = Counter(c for c, _ in served)
+    print(f"{args.days} days, {args.dishes} catalog dishes")
+    print(f"horizon pass, one write : {t_batch:7.2f} s")
+    print(f"save after every day    : {t_daily:7.2f} s")
+    print(f"festival days           : {sum('festival' in p for p in plans)}")
+    print(f"gap violations          : {dict(m.gap_violations) or 0}")
+    for cat in sorted(per_cat):
+        n = sum(v for (c, _), v in served.items() if c == cat)
+        print(f"  {cat:<15} {n:>4} servings of {per_cat[cat]:>4} distinct items (min gap {MIN_REPEAT_GAPS[cat]} d)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Rule-based recipe parsing ahead of the LLM: how many ebook blocks skip the model, and line throughput
+
+    python -m benchmarks.bench_ingredient_parser --recipes 2000
+    python -m benchmarks.bench_ingredient_parser --pdf books/some_cookbook.pdf
+
+Blocks are chunked exactly as ebooks_ingest does (blank-line separated, 200-2500 chars). No model is
+called: a block parse_block rejects is counted as one LLM call. A few known lines are checked first
+(decimals at line start; non-Jain items as plurals, Hindi names, in the method or in lines that don't
+parse) so a regression fails loudly.
+"""
+
+import argparse, time
+from src.ingredient_parser import parse_block, parse_line
+from .synthetic import make_recipe_text
+
+CHECKS = {"1.5 tsp salt": ("salt", 1.5, "tsp"), "0.5 cup milk": ("milk", 0.5, "cup"),
+          "2.5 cups water": ("water", 2.5, "cup"), "1. 2 cups rice": ("rice", 2.0, "cup")}
+NON_JAIN_BLOCKS = ["Aloo Sabzi\n1 cup rice\n2 onions, sliced\n1 tsp jeera", "Batata Nu Shaak\n3 potatoes\n1 tsp rai\nsalt to taste",
+                   "Kanda Poha\n2 cups poha\n1 kanda\n1/2 tsp haldi",
+                   # non-Jain only in the method, and only in a line that doesn't parse as an ingredient
+                   "Jeera Rice\n1 cup rice\n1 tsp jeera\n2 tbsp ghee\nMethod:\n1. Fry the onions and garlic in ghee.\n2. Add rice.",
+                   "Masala Rice\n1 cup rice\n1 tsp jeera\n2 tbsp ghee\n1/2 tsp haldi\nsalt to taste\ngarlic chutney"]
+
+def check():
+    for line, want in CHECKS.items():
+        got = parse_line(line).ingredient
+        assert (got.item, got.qty, got.unit) == want, f"{line!r} parsed as {got}"
+    for block in NON_JAIN_BLOCKS:
+        assert parse_block(block) is None, f"non-Jain block parsed locally: {block.splitlines()[0]}"
+
+def main():
+    ap = argparse.ArgumentParser("bench_ingredient_parser")
+    ap.add_argument("--recipes", type=int, default=2000)
+    ap.add_argument("--pdf", help="a real ebook instead of the synthetic one")
+    args = ap.parse_args()
+    check()
+
+    if args.pdf:
+        from src.parse_pdf import pdf_to_text
+        text = pdf_to_text(args.pdf)
+    else:
+        text = make_recipe_text(args.recipes)
+    blocks = [c.strip() for c in text.split("\n\n") if 200 <= len(c.strip()) <= 2500]
+
+    t0 = time.perf_counter(); parsed = [parse_block(b) for b in blocks]; t = time.perf_counter() - t0
+    local = sum(p is not None for p in parsed)
+    print(f"{len(blocks)} blocks: {local} parsed locally, {len(blocks) - local} to the LLM "
+          f"({local / max(len(blocks), 1):.1%} of LLM calls avoided) in {t:.2f} s")
+
+    lines = [l for b in blocks for l in b.splitlines()]
+    t0 = time.perf_counter()
+    for l in lines: parse_line(l)
+    t = time.perf_counter() - t0
+    print(f"{len(lines)} lines  {len(lines) / t:,.0f} lines/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Memory held by a catalog as plain dataclass lists, as lists with slotted Ingredients, and as a CompactCatalog
+
+    python -m benchmarks.bench_memory --dishes 200000
+
+Each representation is built from the same Parquet file in a fresh interpreter. "live" is what the
+representation keeps allocated (tracemalloc for Python/NumPy plus Arrow's memory pool) once the
+Parquet table is released; "rss" is resident-set growth over a baseline taken after imports.
+"""
+
+import argparse, gc, json, os, subprocess, sys, tempfile, tracemalloc
+from dataclasses import dataclass
+from typing import List, Optional
+import pyarrow as pa
+
+@dataclass
+class LegacyIngredient:
+    item: str
+    qty: float
+    unit: str
+
+@dataclass
+class LegacyDish:
+    name: str
+    meal_type: str
+    tags: List[str]
+    cook_minutes: int
+    difficulty: int
+    ingredients: List[LegacyIngredient]
+    steps: List[str]
+    flavor_text: Optional[str] = None
+    rarity: Optional[str] = "common"
+    variant_adults: Optional[str] = None
+    variant_kids: Optional[str] = None
+    photo_bytes: Optional[bytes] = None
+    public_url: Optional[str] = None
+
+def _rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+def _measure(kind: str, path: str) -> dict:
+    from src.catalog import read_table, table_to_dishes
+    from src.compact_catalog import CompactCatalog
+    gc.collect(); base = _rss()
+    tracemalloc.start(); arrow_base = pa.total_allocated_bytes()
+    table = read_table(path)
+    if kind == "legacy":
+        obj = [LegacyDish(d.name, d.meal_type, d.tags, d.cook_minutes, d.difficulty,
+                          [LegacyIngredient(i.item, i.qty, i.unit) for i in d.ingredients],
+                          d.steps, d.flavor_text, d.rarity, public_url=d.public_url)
+               for d in table_to_dishes(table)]
+    elif kind == "dishes":
+        obj = table_to_dishes(table)
+    else:
+        obj = CompactCatalog.from_table(table)
+    del table; gc.collect(); pa.default_memory_pool().release_unused()
+    live = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - arrow_base
+    tracemalloc.stop()
+    return {"kind": kind, "n": len(obj), "live": live, "rss": _rss() - base}
+
+def main():
+    ap = argparse.ArgumentParser("bench_memory")
+    ap.add_argument("--dishes", type=int, default=200000)
+    ap.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        print(json.dumps(_measure(*args.child))); return
+
+    from src.catalog import write_catalog
+    from .synthetic import make_dishes
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dishes.parquet")
+        write_catalog(path, make_dishes(args.dishes))
+        rows = []
+        for kind in ("legacy", "dishes", "compact"):
+            out = subprocess.run([sys.executable, "-m", "benchmarks.bench_memory", "--child", kind, path],
+                                 capture_output=True, text=True, check=True).stdout
+            rows.append(json.loads(out))
+    legacy = rows[0]["live"]
+    labels = {"legacy": "dataclass lists (before)", "dishes": "slotted Ingredient lists", "compact": "CompactCatalog"}
+    print(f"{args.dishes} dishes{'':<17} {'live MiB':>9} {'B/dish':>7} {'rss MiB':>8}")
+    for r in rows:
+        print(f"  {labels[r['kind']]:<26} {r['live']/2**20:9.1f} {r['live']/r['n']:7.0f} {r['rss']/2**20:8.1f}"
+              f"  ({legacy/max(r['live'],1):.1f}x smaller)")
+
+if __name__ == "__main__":
+    main()
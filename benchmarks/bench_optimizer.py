@@ -0,0 +1,43 @@
+"""
+Whole-day optimizer vs greedy slot-by-slot picks as the pantry gets tighter
+
+    python -m benchmarks.bench_optimizer --dishes 10000 --scales 0.02,0.05,0.2 --budgets 20,200,1000
+
+"overdrawn" marks a greedy day whose dishes each fit the pantry but together need more than it holds.
+"""
+
+import argparse, time
+from collections import defaultdict
+from src.suggest import plan_day
+from .bench_plan import make_plan_data
+
+def overdrawn(stock: dict, plan: dict) -> bool:
+    need = defaultdict(float)
+    for slots in plan.values():
+        for d in slots.values():
+            for i in d.ingredients: need[i.item.lower()] += i.qty or 0
+    return any(stock.get(k, {"qty": 0})["qty"] < q for k, q in need.items() if k)
+
+def main():
+    ap = argparse.ArgumentParser("bench_optimizer")
+    ap.add_argument("--dishes", type=int, default=10000)
+    ap.add_argument("--scales", default="0.02,0.05,0.2", help="pantry size relative to the synthetic default")
+    ap.add_argument("--budgets", default="20,200,1000")
+    args = ap.parse_args()
+
+    data = make_plan_data(args.dishes)
+    modes = [("greedy", dict(optimize=False))] + [(f"optimize {b} ms", dict(optimize=True, budget_ms=int(b)))
+                                                   for b in args.budgets.split(",")]
+    print(f"{args.dishes} dishes")
+    print(f"{'pantry':>7} {'mode':<18} {'filled':>7} {'score':>8} {'overdrawn':>10} {'ms':>8}")
+    for scale in [float(x) for x in args.scales.split(",")]:
+        stock = {k: dict(v, qty=v["qty"] * scale) for k, v in data.stock.items()}
+        ok = data.scorer.pantry_ok(stock)
+        for label, kw in modes:
+            t0 = time.perf_counter(); plan = plan_day(data, stock, set(), **kw); t = time.perf_counter() - t0
+            ids = [data.scorer.name_ids[d.name.lower()][0] for s in plan.values() for d in s.values()]
+            total = float(data.scorer.scores(ids, ok, data.scorer.used_mask(())).sum())
+            print(f"{scale:>7} {label:<18} {len(ids):>7} {total:>8.0f} {str(overdrawn(stock, plan)):>10} {1000*t:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+PDF text extraction throughput: serial pdfplumber vs page ranges sharded across a process pool
+
+    python -m benchmarks.bench_pdf_extract --pages 300 --workers 1,2,4,8
+
+Every run must produce the same text as the serial pass. Scaling tops out at the machine's core
+count (os.cpu_count() is printed); extra workers beyond it only add process start-up cost.
+Extraction runs bypass the text cache; the last line is a re-read served from a warm cache.
+"""
+
+import argparse, os, tempfile, time
+from src import text_cache
+from src.parse_pdf import pdf_to_text
+from .synthetic import make_cookbook_pdf
+
+def main():
+    ap = argparse.ArgumentParser("bench_pdf_extract")
+    ap.add_argument("--pages", type=int, default=300)
+    ap.add_argument("--workers", default="1,2,4")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = make_cookbook_pdf(os.path.join(tmp, "book.pdf"), args.pages)
+        text_cache.TEXT_CACHE_DIR = ""
+        print(f"{args.pages} pages, {os.cpu_count()} cpus")
+        base = base_t = None
+        for w in (int(x) for x in args.workers.split(",")):
+            t0 = time.perf_counter(); text = pdf_to_text(pdf, workers=w); t = time.perf_counter() - t0
+            if base is None: base, base_t = text, t
+            assert text == base, f"workers={w} changed the extracted text"
+            print(f"  workers={w:<3} {t:8.2f} s  {args.pages/t:8.1f} pages/s  ({base_t/t:.2f}x)")
+
+        text_cache.TEXT_CACHE_DIR = os.path.join(tmp, "text_cache")
+        pdf_to_text(pdf)
+        t0 = time.perf_counter(); text = pdf_to_text(pdf); t = time.perf_counter() - t0
+        assert text == base, "cached text differs from extraction"
+        print(f"  cached       {t:8.3f} s  {args.pages/t:8.0f} pages/s  ({base_t/t:.0f}x)")
+
+if __name__ == "__main__":
+    main()
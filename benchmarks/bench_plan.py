@@ -0,0 +1,45 @@
+"""
+Multi-day planning benchmark: suggest_for_day called once per day vs suggest_for_range
+
+    python -m benchmarks.bench_plan --dishes 10000 --days 30
+
+Both run against an in-memory synthetic catalog, so the per-day loop is charged only for
+re-deriving candidates and scoring, not for the Excel reads it also repeats in production.
+"""
+
+import argparse, time
+from datetime import date, timedelta
+from src.compact_catalog import CompactCatalog
+from src.tag_index import TagIndex
+from src.suggest import PlanData, suggest_for_day, suggest_for_range
+from .synthetic import make_dishes, make_pantry
+
+def make_plan_data(n: int) -> PlanData:
+    catalog = CompactCatalog.from_dishes(make_dishes(n))
+    return PlanData(stock=make_pantry(), catalog=catalog, index=TagIndex.build(catalog), slots={},
+                    variants={("adult", "protein"): "lean tofu/paneer portion", ("kids", "protein"): "paneer cubes"})
+
+def main():
+    ap = argparse.ArgumentParser("bench_plan")
+    ap.add_argument("--dishes", type=int, default=10000)
+    ap.add_argument("--days", type=int, default=30)
+    args = ap.parse_args()
+    start = date(2025, 1, 1)
+
+    t0 = time.perf_counter()
+    for k in range(args.days):
+        suggest_for_day(start + timedelta(days=k), data=make_plan_data(args.dishes))
+    t_day = time.perf_counter() - t0
+
+    data = make_plan_data(args.dishes)
+    t0 = time.perf_counter(); plans = suggest_for_range(start, args.days, data=data); t_range = time.perf_counter() - t0
+    assert plans[start] == suggest_for_day(start, data=data)
+
+    picked = sum(len(s) for p in plans.values() for s in p.values())
+    distinct = len({d.name for p in plans.values() for s in p.values() for d in s.values()})
+    print(f"{args.dishes} dishes, {args.days} days ({picked} slots filled, {distinct} distinct dishes)")
+    print(f"suggest_for_day x {args.days:<4}: {t_day:8.2f} s   (catalog rebuilt per call)")
+    print(f"suggest_for_range   : {t_range:8.2f} s   ({t_day/t_range:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Scoring benchmark: score()/pantry_ok() per dish with a sorted key vs CatalogScorer over the whole candidate set
+
+    python -m benchmarks.bench_scoring --dishes 10000,100000
+"""
+
+import argparse, time
+import numpy as np
+from src.compact_catalog import CompactCatalog
+from src.scoring import CatalogScorer, score
+from src.suggest import pick_for_slot
+from .synthetic import make_dishes, make_pantry
+
+def main():
+    ap = argparse.ArgumentParser("bench_scoring")
+    ap.add_argument("--dishes", default="10000,100000")
+    args = ap.parse_args()
+
+    stock = make_pantry()
+    print(f"{'dishes':>8} {'per-dish s':>11} {'vector s':>9} {'speedup':>8} {'scorer build s':>15}")
+    for n in [int(x) for x in args.dishes.split(",")]:
+        catalog = CompactCatalog.from_dishes(make_dishes(n))
+        dishes = list(catalog)
+        used = {d.name.lower() for d in dishes[::97]}
+
+        t0 = time.perf_counter(); scorer = CatalogScorer(catalog); t_build = time.perf_counter() - t0
+        t0 = time.perf_counter(); old = [score(d, stock, used) for d in dishes]; pick_old = pick_for_slot(dishes, stock, used)
+        t_old = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        ids = np.arange(n); ok, mask = scorer.pantry_ok(stock), scorer.used_mask(used)
+        new = scorer.scores(ids, ok, mask); pick_new = scorer.best(ids, ok, mask)
+        t_new = time.perf_counter() - t0
+
+        assert np.array_equal(np.array(old), new), "vector scores must equal score()"
+        assert pick_old == dishes[pick_new]
+        print(f"{n:>8} {t_old:>11.3f} {t_new:>9.4f} {t_old/t_new:>7.0f}x {t_build:>15.3f}")
+
+if __name__ == "__main__":
+    main()
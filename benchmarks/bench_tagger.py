@@ -0,0 +1,85 @@
+"""
+Keyword tagging benchmark: per-keyword substring scans vs the shared Aho-Corasick matcher
+
+    python -m benchmarks.bench_tagger --lines 12000
+
+Runs guess_tags, infer_cuisine and select_best_youtube_channel over ebook-like lines, checks the
+results match the old implementations line for line, and times the pure-Python automaton and
+(when installed) pyahocorasick.
+"""
+
+import argparse, random, time
+from src import keyword_matcher
+from src.normalize import SLOT_KEYWORDS, guess_tags
+from src.ebooks_ingest import CUISINE_HINTS, infer_cuisine
+from src.youtube_curated import PREMIUM_YOUTUBE_CHANNELS, select_best_youtube_channel
+from .synthetic import WORDS, ITEMS
+
+def legacy_guess_tags(name, meal_hint=None, cuisine_hint=None):
+    low = (name or "").lower()
+    tags = ["jain","vegetarian"]
+    if cuisine_hint: tags.append(f"cuisine:{cuisine_hint.lower()}")
+    for slot, kws in SLOT_KEYWORDS.items():
+        if any(k in low for k in kws): tags.append(slot)
+    if meal_hint and all(not t.startswith(meal_hint) for t in tags): tags.append(f"{meal_hint}:misc")
+    return list(dict.fromkeys(tags))
+
+def legacy_infer_cuisine(title):
+    t = (title or "").lower()
+    for k, hints in CUISINE_HINTS.items():
+        if any(h in t for h in hints): return k
+    return None
+
+def legacy_channel(recipe_name, cuisine_hint=None):
+    recipe_lower, cuisine_lower = recipe_name.lower(), (cuisine_hint or '').lower()
+    scores = {}
+    for key, ch in PREMIUM_YOUTUBE_CHANNELS.items():
+        sp, score = ch['specialties'], 0
+        score += sum(3 for s in sp if s in recipe_lower)
+        if cuisine_hint: score += sum(2 for s in sp if s in cuisine_lower)
+        if ('vegan' in recipe_lower or 'plant' in recipe_lower) and 'vegan' in sp: score += 5
+        if ('gujarati' in recipe_lower or 'thepla' in recipe_lower or 'dhokla' in recipe_lower) and 'gujarati' in sp: score += 5
+        if ('south' in cuisine_lower or any(w in recipe_lower for w in ['dosa', 'idli', 'sambhar', 'rasam'])) and 'south_indian' in sp: score += 5
+        if ('healthy' in recipe_lower or 'quinoa' in recipe_lower or 'superfood' in recipe_lower) and ('healthy' in sp or 'satvik' in sp): score += 4
+        scores[key] = score
+    return PREMIUM_YOUTUBE_CHANNELS[max(scores, key=scores.get)]
+
+def make_lines(n, seed=11):
+    rnd = random.Random(seed)
+    vocab = WORDS + ITEMS + ["kerala", "punjabi", "vegan", "healthy", "the", "with", "and", "of", "fresh", "style"]
+    hints = [w for ws in CUISINE_HINTS.values() for w in ws]
+    out = []
+    for _ in range(n):
+        words = [rnd.choice(vocab) for _ in range(rnd.randint(2, 7))]
+        if rnd.random() < 0.2: words.append(rnd.choice(hints))
+        out.append(" ".join(words).title())
+    return out
+
+def run(lines):
+    return ([guess_tags(l, "dinner") for l in lines], [infer_cuisine(l) for l in lines],
+            [select_best_youtube_channel(l, "south indian")["name"] for l in lines])
+
+def main():
+    ap = argparse.ArgumentParser("bench_tagger")
+    ap.add_argument("--lines", type=int, default=12000)
+    args = ap.parse_args()
+    lines = make_lines(args.lines)
+
+    t0 = time.perf_counter()
+    expected = ([legacy_guess_tags(l, "dinner") for l in lines], [legacy_infer_cuisine(l) for l in lines],
+                [legacy_channel(l, "south indian")["name"] for l in lines])
+    t_old = time.perf_counter() - t0
+    print(f"{args.lines} lines; keywords: {len(keyword_matcher.matcher().labels)}")
+    print(f"substring scans      : {t_old:7.3f} s")
+
+    backends = [("pure-Python automaton", None)] + ([("pyahocorasick", keyword_matcher.ahocorasick)] if keyword_matcher.ahocorasick else [])
+    for label, module in backends:
+        keyword_matcher.ahocorasick = module
+        keyword_matcher._MATCHER = None
+        keyword_matcher.matcher()
+        t0 = time.perf_counter(); got = run(lines); t = time.perf_counter() - t0
+        assert got == expected, f"{label}: tagging results differ"
+        print(f"{label:<21}: {t:7.3f} s   ({t_old/t:.1f}x, identical results)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+dishes.xlsx decode microbenchmark: the old iterrows + per-row json.loads loop vs the column decoder
+
+    python -m benchmarks.bench_xlsx_decode --rows 50000
+"""
+
+import argparse, json, tempfile, time
+from pathlib import Path
+import pandas as pd
+from src.io_xls import dishes_from_frame, write_dishes_xlsx
+from src.models import Dish, Ingredient
+from .synthetic import make_dishes
+
+def legacy_decode(df: pd.DataFrame):
+    """read_dishes as it was before the column decoder, minus the read_excel call"""
+    dishes = []
+    for _, r in df.iterrows():
+        tags = r.get("tags")
+        tags = json.loads(tags) if isinstance(tags, str) else (tags or [])
+        ings = r.get("ingredients_json")
+        ings = json.loads(ings) if isinstance(ings, str) else (ings or [])
+        steps = r.get("steps_json")
+        steps = json.loads(steps) if isinstance(steps, str) else (steps or [])
+        dishes.append(Dish(
+            name=str(r["name"]).strip(),
+            meal_type=str(r["meal_type"]).strip().lower(),
+            tags=[str(t).strip().lower() for t in tags],
+            cook_minutes=int(r.get("cook_minutes",20)),
+            difficulty=int(r.get("difficulty",2)),
+            ingredients=[Ingredient(i.get("item","").lower(), float(i.get("qty",0) or 0), i.get("unit","")) for i in ings],
+            steps=[str(s) for s in steps],
+            flavor_text=(str(r.get("flavor_text")) if pd.notna(r.get("flavor_text")) else None),
+            rarity=str(r.get("rarity","common")).lower()
+        ))
+    return dishes
+
+def main():
+    ap = argparse.ArgumentParser("bench_xlsx_decode")
+    ap.add_argument("--rows", type=int, default=50000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = Path(tmp) / "dishes.xlsx"
+        write_dishes_xlsx(str(xlsx), make_dishes(args.rows))
+        t0 = time.perf_counter(); df = pd.read_excel(xlsx, sheet_name=0); t_read = time.perf_counter() - t0
+
+        t0 = time.perf_counter(); old = legacy_decode(df); t_old = time.perf_counter() - t0
+        t0 = time.perf_counter(); new = dishes_from_frame(df); t_new = time.perf_counter() - t0
+        assert old == new, "column decoder must produce identical dishes"
+
+    n = args.rows
+    print(f"rows                 : {n}")
+    print(f"pd.read_excel        : {t_read:8.2f} s   (shared by both decoders)")
+    print(f"iterrows decode      : {t_old:8.2f} s   {n/t_old:>10,.0f} rows/s")
+    print(f"column decode        : {t_new:8.2f} s   {n/t_new:>10,.0f} rows/s   ({t_old/t_new:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Synthetic catalogs for the Nigela benchmarks
+Deterministic dishes shaped like ebook ingests: Jain/veg tags, a slot tag, a cuisine, 3-8 ingredients
+"""
+
+import random
+from typing import Dict, List
+from src.models import Dish, Ingredient
+from src.normalize import SLOT_KEYWORDS
+
+CUISINES = ["gujarati","rajasthani","kerala","tamil","goan","north","south","italian","mexican","japanese"]
+ITEMS = ["rice","moong dal","toor dal","paneer","ragi flour","wheat flour","jowar flour","bajra flour","spinach",
+         "tomato","cumin","turmeric","ghee","curd","banana","papaya","coconut","peanuts","sesame","jaggery",
+         "lemon","coriander","methi","besan","semolina","poha","quinoa","cabbage","beans","bhindi"]
+WORDS = ["masala","tadka","sabzi","khichdi","dosa","thepla","dal","pulao","soup","tikki","chilla","kadhi","salad","paratha","upma"]
+
+def make_dishes(n: int, seed: int = 7) -> List[Dish]:
+    rnd = random.Random(seed)
+    slots = list(SLOT_KEYWORDS)
+    out = []
+    for k in range(n):
+        slot = rnd.choice(slots)
+        tags = ["jain","vegetarian",slot,f"cuisine:{rnd.choice(CUISINES)}"]
+        if rnd.random() < 0.3: tags.append("kid-friendly")
+        ings = [Ingredient(it, float(rnd.randint(1, 300)), rnd.choice(["g","ml","tsp","pc"]))
+                for it in rnd.sample(ITEMS, rnd.randint(3, 8))]
+        out.append(Dish(
+            name=f"{rnd.choice(WORDS).title()} {rnd.choice(WORDS).title()} #{k}",
+            meal_type=slot.split(":")[0], tags=tags,
+            cook_minutes=rnd.randint(5, 60), difficulty=rnd.randint(1, 4),
+            ingredients=ings, steps=[f"Step {s+1}" for s in range(rnd.randint(2, 6))],
+            flavor_text="Nigela whispers: keep it gentle.", rarity=rnd.choice(["common","rare","epic"]),
+        ))
+    return out
+
+def make_pantry(seed: int = 7, stocked: float = 0.8) -> Dict[str, dict]:
+    """read_pantry-shaped stock holding most of ITEMS, enough for a few weeks of cooking"""
+    rnd = random.Random(seed)
+    return {it: {"unit": "g", "qty": float(rnd.randint(500, 20000)), "min_par": 200.0}
+            for it in ITEMS if rnd.random() < stocked}
+
+def make_cookbook_pdf(path: str, pages: int, seed: int = 7, per_page: int = 40) -> str:
+    """Text cookbook PDF: a heading per page and dish-like lines, the shape ingest-pdf parses"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    rnd = random.Random(seed)
+    c = canvas.Canvas(path, pagesize=A4)
+    _, height = A4
+    for p in range(pages):
+        c.setFont("Helvetica-Bold", 14); c.drawString(50, height - 50, f"Chapter {p+1}: {rnd.choice(CUISINES).title()} kitchen")
+        c.setFont("Helvetica", 9)
+        for k in range(per_page):
+            line = f"{rnd.choice(WORDS).title()} {rnd.choice(WORDS)} with {rnd.choice(ITEMS)} and {rnd.choice(ITEMS)}"
+            c.drawString(50, height - 80 - 18 * k, line)
+        c.showPage()
+    c.save()
+    return path
+
+AMOUNTS = ["1 cup", "1/2 cup", "1 1/2 cups", "¾ cup", "2 tbsp", "1 tsp", "½ tsp", "1/4 tsp", "200 g", "250 ml",
+           "1 katori", "2-3", "1 chhota chamach", "a pinch of", "2 to 3 tbsp", "1 inch", "10-12"]
+HINDI_ITEMS = ["jeera", "haldi", "hing", "dahi", "chawal", "atta", "suji", "palak", "tamatar", "hari mirch",
+               "kadi patta", "gud", "til", "moongphali", "nariyal"]
+NON_JAIN_ITEMS = ["onion", "garlic", "potato", "ginger", "carrot", "onions", "potatoes", "kanda"]
+
+def make_recipe_text(n: int, seed: int = 7, clean: float = 0.7, non_jain: float = 0.15) -> str:
+    """Cookbook text of n recipes separated by blank lines, as pdf_to_text returns it: most are a title,
+    an ingredient list (fractions, ranges, katori/chamach, Hindi names) and a numbered method; the rest
+    are narrative paragraphs, and some call for onion/garlic and so need the model's substitutions"""
+    rnd = random.Random(seed)
+    out = []
+    for k in range(n):
+        title = f"{rnd.choice(WORDS).title()} {rnd.choice(WORDS).title()}"
+        items = rnd.sample(ITEMS + HINDI_ITEMS, rnd.randint(5, 9))
+        if rnd.random() < non_jain: items[-1] = rnd.choice(NON_JAIN_ITEMS)
+        if rnd.random() < clean:
+            lines = [title, "Ingredients:"] + [f"{rnd.choice(AMOUNTS)} {it}" for it in items] + ["Salt to taste", "Method:"]
+            lines += [f"{s+1}. {rnd.choice(['Heat', 'Stir in', 'Simmer', 'Add'])} the {rnd.choice(items)} "
+                      f"for {rnd.randint(2, 15)} minutes." for s in range(rnd.randint(3, 6))]
+        else:
+            lines = [title, f"My grandmother made this every monsoon with {', '.join(items[:-1])} and {items[-1]}.",
+                     f"Roast {rnd.choice(AMOUNTS)} {items[0]} until it smells nutty, then add whatever {items[1]} is left.",
+                     f"Let it bubble for about {rnd.randint(5, 30)} minutes and serve it hot with {rnd.choice(WORDS)}."]
+        out.append("\n".join(lines))
+    return "\n\n".join(out)
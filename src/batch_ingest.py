@@ -2,6 +2,7 @@ import json, os, time, hashlib
 from pathlib import Path
 from .parse_pdf import pdf_to_text
 from .config import OPENAI_MODEL_MAIN, OPENAI_API_KEY
+from .ingredient_parser import parse_block
 from openai import OpenAI
 
 def _chunks(text: str, min_len=200, max_len=2500):
@@ -39,16 +40,25 @@ def _write_jsonl(path: str, rows):
         for r in rows:
             f.write(json.dumps(r, ensure_ascii=False) + "\n")
 
-def make_jsonl(manifest: str, out_path: str):
+def make_jsonl(manifest: str, out_path: str, workers: int = 1):
     books = json.loads(Path(manifest).read_text())
     blocks=[]
     for b in books:
         p = b.get("path"); 
         if not p or not Path(p).exists(): continue
-        txt = pdf_to_text(p)
+        txt = pdf_to_text(p, workers)
         blocks.extend(list(_chunks(txt)))
-    _write_jsonl(out_path, _as_chat_completion_jsonl(blocks))
-    print(f"Wrote {out_path} with {len(blocks)} chunks")
+    # clean blocks never need a batch request: their parsed JSON goes to <out>.local.jsonl instead
+    local, remote = [], []
+    for ch in blocks:
+        parsed = parse_block(ch)
+        if parsed: local.append(parsed)
+        else: remote.append(ch)
+    _write_jsonl(out_path, _as_chat_completion_jsonl(remote))
+    local_path = str(Path(out_path).with_suffix(".local.jsonl"))
+    _write_jsonl(local_path, local)
+    print(f"Wrote {out_path} with {len(remote)} chunks; {len(local)} parsed locally into {local_path} "
+          f"({len(local) / max(len(blocks), 1):.0%} of requests avoided)")
 
 def submit(jsonl_path: str):
     client = OpenAI(api_key=OPENAI_API_KEY)
@@ -70,10 +80,10 @@ if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser("batch")
     sub = ap.add_subparsers(dest="cmd")
-    m = sub.add_parser("make-jsonl"); m.add_argument("--manifest", required=True); m.add_argument("--out", required=True)
+    m = sub.add_parser("make-jsonl"); m.add_argument("--manifest", required=True); m.add_argument("--out", required=True); m.add_argument("--workers", type=int, default=1)
     s = sub.add_parser("submit"); s.add_argument("--jsonl", required=True)
     c = sub.add_parser("collect"); c.add_argument("--batch-id", required=True)
     args = ap.parse_args()
-    if args.cmd == "make-jsonl": make_jsonl(args.manifest, args.out)
+    if args.cmd == "make-jsonl": make_jsonl(args.manifest, args.out, args.workers)
     elif args.cmd == "submit": submit(args.jsonl)
     elif args.cmd == "collect": collect(args.batch_id)
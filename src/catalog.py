@@ -0,0 +1,105 @@
+"""
+Columnar Dish Catalog for Nigela
+Parquet snapshot of the SQLite dish store, stamped with the store version it was built from,
+so full-catalog loads skip SQL joins and per-row JSON decoding
+"""
+
+import gc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .models import Dish, Ingredient
+
+CATALOG_FILE = "dishes.parquet"
+VERSION_KEY = b"nigela.catalog_version"
+
+_INGREDIENT = pa.struct([("item", pa.string()), ("qty", pa.float64()), ("unit", pa.string())])
+
+CATALOG_SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("meal_type", pa.string()),
+    ("tags", pa.list_(pa.string())),
+    ("cook_minutes", pa.int32()),
+    ("difficulty", pa.int16()),
+    ("ingredients", pa.list_(_INGREDIENT)),
+    ("steps", pa.list_(pa.string())),
+    ("flavor_text", pa.string()),
+    ("rarity", pa.string()),
+    ("public_url", pa.string()),
+])
+
+@contextmanager
+def paused_gc():
+    """Bulk-building Dish/Ingredient objects only allocates, so cyclic GC passes are pure overhead"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled: gc.enable()
+
+def catalog_path(path) -> Path:
+    """Parquet catalog that sits next to a dishes.xlsx (or is the path itself)"""
+    p = Path(path)
+    return p if p.suffix == ".parquet" else p.with_name(CATALOG_FILE)
+
+def catalog_version(path) -> Optional[int]:
+    """Store version the snapshot was built from (None if missing or unstamped)"""
+    p = catalog_path(path)
+    if not p.exists(): return None
+    meta = pq.read_schema(p).metadata or {}
+    return int(meta[VERSION_KEY]) if VERSION_KEY in meta else None
+
+def dishes_to_table(dishes: List[Dish]) -> pa.Table:
+    cols = {
+        "name": [d.name for d in dishes],
+        "meal_type": [d.meal_type for d in dishes],
+        "tags": [list(d.tags or []) for d in dishes],
+        "cook_minutes": [int(d.cook_minutes) for d in dishes],
+        "difficulty": [int(d.difficulty) for d in dishes],
+        "ingredients": [[{"item": i.item, "qty": float(i.qty or 0), "unit": i.unit} for i in d.ingredients] for d in dishes],
+        "steps": [list(d.steps or []) for d in dishes],
+        "flavor_text": [d.flavor_text for d in dishes],
+        "rarity": [d.rarity or "common" for d in dishes],
+        "public_url": [d.public_url for d in dishes],
+    }
+    return pa.table(cols, schema=CATALOG_SCHEMA)
+
+def table_to_dishes(table: pa.Table) -> List[Dish]:
+    # column-at-a-time decode: nested lists come straight out of Arrow, no JSON parsing
+    with paused_gc():
+        c = {name: table.column(name).to_pylist() for name in CATALOG_SCHEMA.names if name in table.column_names}
+        urls = c.get("public_url") or [None] * table.num_rows
+        return [
+            Dish(
+                name=name, meal_type=meal, tags=tags or [],
+                cook_minutes=cm, difficulty=diff,
+                ingredients=[Ingredient(i["item"], i["qty"], i["unit"]) for i in (ings or [])],
+                steps=steps or [], flavor_text=ft, rarity=rarity or "common", public_url=url,
+            )
+            for name, meal, tags, cm, diff, ings, steps, ft, rarity, url in zip(
+                c["name"], c["meal_type"], c["tags"], c["cook_minutes"], c["difficulty"],
+                c["ingredients"], c["steps"], c["flavor_text"], c["rarity"], urls)
+        ]
+
+def read_table(path) -> pa.Table:
+    return pq.read_table(catalog_path(path))
+
+def read_catalog(path) -> List[Dish]:
+    return table_to_dishes(read_table(path))
+
+def write_catalog(path, dishes: List[Dish], version: Optional[int] = None) -> Path:
+    return write_table(path, dishes_to_table(dishes), version)
+
+def write_table(path, table: pa.Table, version: Optional[int] = None) -> Path:
+    """Atomically replace the catalog (write to a temp file, then rename)"""
+    dest = catalog_path(path)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".tmp")
+    if version is not None:
+        table = table.replace_schema_metadata({VERSION_KEY: str(version).encode()})
+    pq.write_table(table, tmp, compression="zstd")
+    tmp.replace(dest)
+    return dest
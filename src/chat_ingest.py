@@ -0,0 +1,170 @@
+"""
+WhatsApp Chat-export Ingest for Nigela
+Streams an exported chat (`[dd/mm/yy, h:mm:ss PM] Sender: text`) one line at a time, groups the
+lines into messages, picks out menu posts ("The lunch menu for today 16th May, 2024" followed by
+bullets) and writes two things in batches: new dishes into the catalog journal, and a dated record
+of every menu seen in data/observed_menus.jsonl. Memory stays flat however long the export is:
+only the current message, one batch and the set of dish names already seen are held.
+"""
+
+import json, os, re
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from .io_xls import write_dishes_stream
+from .normalize import iter_dishes
+
+OBSERVED_FILE = "observed_menus.jsonl"
+
+HEADER = re.compile(r"^\u200e?\[(\d{1,2})/(\d{1,2})/(\d{2,4}),\s*([^\]]+)\]\s*([^:]+):\s?(.*)$")
+MENU_TITLE = re.compile(r"\b(breakfast|lunch|supper|dinner|snacks?|food)\s+menu\b(?:\s+for)?(?:\s+today)?"
+                        r"(?:[\s,]+(\d{1,2})(?:st|nd|rd|th)?[\s,]+([A-Za-z]+)(?:[\s,]+(\d{4}))?)?", re.I)
+BULLET = re.compile(r"^[^\w]*?[*•●◦·\-–]\s*(?=\w)")
+SIGN_OFF = re.compile(r"^\s*(thank you|thanks|regards)\b", re.I)
+NOT_DISH = re.compile(r"[^A-Za-z0-9 ()/&,+.'-]+")
+
+MEALS = {"breakfast": "breakfast", "lunch": "lunch", "food": "lunch", "supper": "dinner", "dinner": "dinner",
+         "snack": "evening_snack", "snacks": "evening_snack"}
+MONTHS = {m: k for k, names in enumerate(
+    [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",), ("jun", "june"),
+     ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+     ("dec", "december")], 1) for m in names}
+
+class Message(NamedTuple):
+    day: date
+    sender: str
+    lines: List[str]
+
+class Menu(NamedTuple):
+    day: date
+    meal: str
+    items: List[str]
+    sender: str
+
+@dataclass
+class ChatStats:
+    messages: int = 0
+    menus: int = 0
+    items: int = 0
+    dishes: int = 0
+    history: int = 0
+
+def iter_messages(lines: Iterable[str], dayfirst: bool = True, stats: Optional[ChatStats] = None) -> Iterator[Message]:
+    """Group export lines into messages; continuation lines belong to the last header"""
+    cur: Optional[Message] = None
+    for line in lines:
+        m = HEADER.match(line)
+        if not m:
+            if cur: cur.lines.append(line.rstrip("\n"))
+            continue
+        if cur: yield cur
+        a, b, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        d, mo = (a, b) if dayfirst else (b, a)
+        try:
+            day = date(y + 2000 if y < 100 else y, mo, d)
+        except ValueError:
+            cur = None; continue
+        cur = Message(day, m.group(5).strip(), [m.group(6)])
+        if stats: stats.messages += 1
+    if cur: yield cur
+
+def _menu_day(m: re.Match, sent: date) -> date:
+    """Date named in the menu title, else the day it was posted. A title without a year takes the
+    posting year, moved a year when that lands more than six months away (December posts for January)."""
+    if not m.group(2): return sent
+    month = MONTHS.get(m.group(3).lower())
+    if not month: return sent
+    try:
+        if m.group(4): return date(int(m.group(4)), month, int(m.group(2)))
+        day = date(sent.year, month, int(m.group(2)))
+        if (day - sent).days > 183: day = day.replace(year=sent.year - 1)
+        elif (sent - day).days > 183: day = day.replace(year=sent.year + 1)
+        return day
+    except ValueError:
+        return sent
+
+def clean_item(text: str) -> str:
+    """'●Jain Ragda pattice with Date chutney. 🥣' -> 'Jain Ragda pattice with Date chutney'"""
+    s = re.sub(r"\s+", " ", NOT_DISH.sub(" ", text.replace("*", " "))).strip(" .,-")
+    return s[:1].upper() + s[1:]
+
+def parse_menu(msg: Message) -> Optional[Menu]:
+    for k, line in enumerate(msg.lines):
+        title = MENU_TITLE.search(line)
+        if title: break
+    else:
+        return None
+    items = []
+    for line in msg.lines[k + 1:]:
+        if SIGN_OFF.match(line): break
+        bullet = BULLET.match(line)
+        if not bullet: continue
+        item = clean_item(line[bullet.end():])
+        if len(item) >= 3: items.append(item)
+    if not items: return None
+    return Menu(_menu_day(title, msg.day), MEALS[title.group(1).lower()], items, msg.sender)
+
+def iter_menus(lines: Iterable[str], dayfirst: bool = True, stats: Optional[ChatStats] = None) -> Iterator[Menu]:
+    for msg in iter_messages(lines, dayfirst, stats):
+        menu = parse_menu(msg)
+        if menu: yield menu
+
+class ObservedMenus:
+    """Buffered appends to observed_menus.jsonl; a (date, meal) already recorded is skipped, so
+    re-ingesting an export (or a longer one covering the same dates) adds only the new days"""
+    def __init__(self, path, batch_size: int = 500):
+        self.path = Path(path); self.batch_size = batch_size
+        self.buffer: List[str] = []; self.written = 0
+        self.recorded: Set[Tuple[str, str]] = set()
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        r = json.loads(line); self.recorded.add((r["date"], r["meal"]))
+                    except (ValueError, KeyError):
+                        continue
+
+    def add(self, menu: Menu):
+        key = (menu.day.isoformat(), menu.meal)
+        if key in self.recorded: return
+        self.recorded.add(key)
+        self.buffer.append(json.dumps({"date": key[0], "meal": menu.meal, "items": menu.items,
+                                       "source": menu.sender}, ensure_ascii=False) + "\n")
+        if len(self.buffer) >= self.batch_size: self.flush()
+
+    def flush(self):
+        if not self.buffer: return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(self.buffer))
+            f.flush(); os.fsync(f.fileno())
+        self.written += len(self.buffer); self.buffer.clear()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.flush()
+
+def ingest_chat(path: str, data_dir="data", batch_size: int = 500, dayfirst: bool = True) -> ChatStats:
+    """One pass over the export: each dish name is journaled the first time it appears (school
+    menus are kid-tested, so they are tagged kid-friendly) and every menu lands in the history"""
+    stats = ChatStats()
+    seen: Set[str] = set()
+
+    def dishes(menus: Iterable[Menu], history: ObservedMenus):
+        for menu in menus:
+            stats.menus += 1; stats.items += len(menu.items)
+            history.add(menu)
+            fresh = []
+            for item in menu.items:
+                key = item.lower()
+                if key not in seen:
+                    seen.add(key); fresh.append(item)
+            for d in iter_dishes(fresh, meal_hint=menu.meal):
+                d.tags.append("kid-friendly")
+                yield d
+
+    with open(path, encoding="utf-8", errors="replace") as f, \
+         ObservedMenus(Path(data_dir) / OBSERVED_FILE, batch_size) as history:
+        stats.dishes = write_dishes_stream(f"{data_dir}/dishes.xlsx", dishes(iter_menus(f, dayfirst, stats), history), batch_size)
+    stats.history = history.written
+    return stats
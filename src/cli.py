@@ -1,14 +1,19 @@
 import argparse, asyncio
 from datetime import date, timedelta, datetime
-from .suggest import suggest_for_day
+from .suggest import suggest_for_day, suggest_for_range
 from .cards import generate_cook_cards_pdf
-from .io_xls import write_dishes
-from .parse_url import url_to_dishes
-from .parse_pdf import pdf_to_dishes
-from .parse_image import image_to_dishes
+from .io_xls import read_dishes, write_dishes, write_dishes_stream, open_store, import_dishes_xlsx, export_dishes_xlsx
+from .dish_store import DishStore
+from .ingest_journal import compact, pending_count
+from .parse_url import url_to_dishes, read_url_list, iter_url_dishes, UrlStats, CONCURRENCY, PER_HOST
+from .parse_pdf import iter_pdf_dishes, EXTRACTOR as PDF_EXTRACTOR
+from .parse_image import image_to_dishes, ocr_extractor, list_images, iter_image_dishes, OcrStats
+from . import text_cache
 from .ingest_api import spoonacular_search, edamam_search, map_spoonacular, map_edamam
 from .ebooks import discover_free_cookbooks, fetch_ebooks
 from .ebooks_ingest import ingest_manifest_to_dishes
+from .chat_ingest import ingest_chat, OBSERVED_FILE
+from .menu_import import import_menus
 from .emailer import send_menu_email
 from .youtube_integration import YouTubeVideoFinder, enhance_recipes_with_videos
 
@@ -20,6 +25,11 @@ def print_plan(plan: dict):
             if dish.variant_adults: print(f"  Adults: {dish.variant_adults}")
             if dish.variant_kids:   print(f"  Kids  : {dish.variant_kids}")
 
+def _tagged(dishes, tag: str):
+    for d in dishes:
+        d.tags.append(tag)
+        yield d
+
 def _resolve_date(arg: str) -> date:
     arg = arg.strip().lower()
     if arg in ("today",): return date.today()
@@ -30,19 +40,41 @@ def main():
     ap = argparse.ArgumentParser("nigela")
     sub = ap.add_subparsers(dest="cmd")
 
-    s1 = sub.add_parser("suggest"); s1.add_argument("--date", required=True)
+    s1 = sub.add_parser("suggest"); s1.add_argument("--date", required=True); s1.add_argument("--days", type=int, default=1)
+    s1.add_argument("--optimize", action="store_true", help="choose all slots of a day jointly under the pantry")
+    s1.add_argument("--budget-ms", type=int, default=200); s1.add_argument("--max-cook-minutes", type=int, default=None)
+    s1.add_argument("--no-cache", action="store_true", help="recompute instead of reusing the stored plan")
     s2 = sub.add_parser("cards");   s2.add_argument("--date", required=True); s2.add_argument("--out", required=True)
     em = sub.add_parser("email");   em.add_argument("--for", dest="for_date", required=True, help="'today'|'tomorrow'|YYYY-MM-DD")
 
     iu = sub.add_parser("ingest-url"); iu.add_argument("--url", required=True); iu.add_argument("--meal", default="dinner"); iu.add_argument("--slot", default=None); iu.add_argument("--cuisine", default=None)
-    ip = sub.add_parser("ingest-pdf"); ip.add_argument("--file", required=True); ip.add_argument("--meal", default="dinner"); ip.add_argument("--cuisine", default=None)
+    ius = sub.add_parser("ingest-urls"); ius.add_argument("--file", required=True, help="text file, one URL per line"); ius.add_argument("--meal", default="dinner"); ius.add_argument("--slot", default=None); ius.add_argument("--cuisine", default=None)
+    ius.add_argument("--concurrency", type=int, default=CONCURRENCY); ius.add_argument("--per-host", type=int, default=PER_HOST); ius.add_argument("--batch-size", type=int, default=200)
+    ip = sub.add_parser("ingest-pdf"); ip.add_argument("--file", required=True); ip.add_argument("--meal", default="dinner"); ip.add_argument("--cuisine", default=None); ip.add_argument("--workers", type=int, default=1, help="processes for page extraction")
     ii = sub.add_parser("ingest-image"); ii.add_argument("--file", required=True); ii.add_argument("--cuisine", default=None)
+    im = sub.add_parser("ingest-images"); im.add_argument("--dir", required=True); im.add_argument("--cuisine", default=None); im.add_argument("--recursive", action="store_true")
+    im.add_argument("--workers", type=int, default=None, help="OCR processes (default: all cores)"); im.add_argument("--batch-size", type=int, default=200)
+
+    ic = sub.add_parser("ingest-chat", help="menus from a WhatsApp chat export"); ic.add_argument("--file", default="menus/_chat.txt"); ic.add_argument("--data-dir", default="data")
+    ic.add_argument("--batch-size", type=int, default=500); ic.add_argument("--month-first", action="store_true", help="export dates are mm/dd/yy")
+
+    mi = sub.add_parser("import-menus", help="Weekly Menu.xlsx + 365_*_ideas.md in one transaction"); mi.add_argument("--root", default="."); mi.add_argument("--data-dir", default="data")
 
     ia = sub.add_parser("ingest-api"); ia.add_argument("--provider", choices=["spoonacular","edamam"], required=True); ia.add_argument("--query", required=True); ia.add_argument("--meal", default="dinner"); ia.add_argument("--slot", default=None); ia.add_argument("--cuisine", default=None); ia.add_argument("--n", type=int, default=5)
 
     es = sub.add_parser("ebooks-search"); es.add_argument("--max", type=int, default=20); es.add_argument("--cuisines", default="gujarati,rajasthani,himachali,kerala,tamil,goan,italian,mexican,japanese,burmese,indian chinese"); es.add_argument("--diet", default="jain,vegetarian,eggless,satvik")
     ed = sub.add_parser("ebooks-download"); ed.add_argument("--max", type=int, default=20); ed.add_argument("--out", default="library/ebooks"); ed.add_argument("--cuisines", default="gujarati,rajasthani,himachali,kerala,tamil,goan,italian,mexican,japanese,burmese,indian chinese"); ed.add_argument("--diet", default="jain,vegetarian,eggless,satvik")
-    ei = sub.add_parser("ebooks-ingest"); ei.add_argument("--manifest", default="library/ebooks/manifest.json"); ei.add_argument("--data-dir", default="data"); ei.add_argument("--max-books", type=int, default=20); ei.add_argument("--max-lines", type=int, default=12000)
+    ei = sub.add_parser("ebooks-ingest"); ei.add_argument("--manifest", default="library/ebooks/manifest.json"); ei.add_argument("--data-dir", default="data"); ei.add_argument("--max-books", type=int, default=20); ei.add_argument("--max-lines", type=int, default=12000); ei.add_argument("--workers", type=int, default=1)
+
+    # Parquet catalog <-> dishes.xlsx
+    ci = sub.add_parser("catalog-import"); ci.add_argument("--xlsx", default="data/dishes.xlsx")
+    ce = sub.add_parser("catalog-export"); ce.add_argument("--data-dir", default="data"); ce.add_argument("--out", default="data/dishes.xlsx")
+    cp = sub.add_parser("compact"); cp.add_argument("--data-dir", default="data")
+    cs = sub.add_parser("catalog-search"); cs.add_argument("--query", required=True); cs.add_argument("--data-dir", default="data"); cs.add_argument("--n", type=int, default=20)
+
+    tc = sub.add_parser("text-cache", help="extracted PDF/OCR text cache"); tc.add_argument("action", choices=["stats","prune"])
+    tc.add_argument("--older-than-days", type=float, default=None); tc.add_argument("--max-mb", type=float, default=None)
+    tc.add_argument("--current-only", action="store_true", help="also drop entries from older extractor versions")
 
     # YouTube video enhancement
     yv = sub.add_parser("enhance-videos"); yv.add_argument("--data-dir", default="data"); yv.add_argument("--max-recipes", type=int, default=20)
@@ -50,8 +82,15 @@ def main():
     args = ap.parse_args()
     if args.cmd == "suggest":
         d = _resolve_date(args.date)
-        plan = suggest_for_day(d)
-        print_plan(plan)
+        if args.days > 1:
+            for day, plan in suggest_for_range(d, args.days, optimize=args.optimize, budget_ms=args.budget_ms,
+                                               max_cook_minutes=args.max_cook_minutes).items():
+                print(f"\n##### {day.isoformat()} ({day.strftime('%A')}) #####")
+                print_plan(plan)
+        else:
+            plan = suggest_for_day(d, optimize=args.optimize, budget_ms=args.budget_ms,
+                                   max_cook_minutes=args.max_cook_minutes, cache=not args.no_cache)
+            print_plan(plan)
     elif args.cmd == "cards":
         d = _resolve_date(args.date)
         pdf = generate_cook_cards_pdf(d, dishes=None)  # pass explicit dishes list if you want
@@ -68,14 +107,41 @@ def main():
             for d in dishes: d.tags.append(f"{args.meal}:{args.slot}")
         n = write_dishes("data/dishes.xlsx", dishes)
         print(f"Added {n} dishes from URL")
+    elif args.cmd == "ingest-urls":
+        urls = read_url_list(args.file)
+        stats = UrlStats()
+        dishes = iter_url_dishes(urls, meal_hint=args.meal, cuisine_hint=args.cuisine,
+                                 concurrency=args.concurrency, per_host=args.per_host, stats=stats)
+        if args.slot:
+            dishes = _tagged(dishes, f"{args.meal}:{args.slot}")
+        n = write_dishes_stream("data/dishes.xlsx", dishes, batch_size=args.batch_size)
+        print(f"Added {n} dishes from {stats.urls}/{len(urls)} URLs ({stats.failed} failed, "
+              f"{stats.bytes/2**20:.1f} MiB) in {stats.elapsed:.1f} s, {stats.urls_per_minute:.0f} URLs/min")
+        print(f"Recipe JSON-LD on {stats.structured}/{stats.urls} pages ({stats.jsonld_hit_rate:.0%})")
     elif args.cmd == "ingest-pdf":
-        dishes = pdf_to_dishes(args.file, meal_hint=args.meal, cuisine_hint=args.cuisine)
-        n = write_dishes("data/dishes.xlsx", dishes)
+        # streamed: batches are journaled while later pages are still being extracted
+        dishes = iter_pdf_dishes(args.file, meal_hint=args.meal, cuisine_hint=args.cuisine, workers=args.workers)
+        n = write_dishes_stream("data/dishes.xlsx", dishes)
         print(f"Added {n} dishes from PDF")
     elif args.cmd == "ingest-image":
         dishes = image_to_dishes(args.file, cuisine_hint=args.cuisine)
         n = write_dishes("data/dishes.xlsx", dishes)
         print(f"Added {n} dishes from image OCR")
+    elif args.cmd == "ingest-images":
+        paths = list_images(args.dir, recursive=args.recursive)
+        stats = OcrStats()
+        dishes = iter_image_dishes(paths, cuisine_hint=args.cuisine, workers=args.workers, stats=stats)
+        n = write_dishes_stream("data/dishes.xlsx", dishes, batch_size=args.batch_size)
+        print(f"Added {n} dishes from {stats.pages} images ({stats.empty} without text) "
+              f"at {stats.pages_per_minute:.1f} pages/min")
+    elif args.cmd == "ingest-chat":
+        st = ingest_chat(args.file, data_dir=args.data_dir, batch_size=args.batch_size, dayfirst=not args.month_first)
+        print(f"Read {st.messages} messages: {st.menus} menus, {st.items} menu items")
+        print(f"Added {st.dishes} dishes; recorded {st.history} new menus in {args.data_dir}/{OBSERVED_FILE}")
+    elif args.cmd == "import-menus":
+        st = import_menus(args.root, data_dir=args.data_dir)
+        for name, n in st.sources.items(): print(f"- {name}: {n} dishes")
+        print(f"{st.unique} unique, {st.existing} already in the catalog; added {st.added}")
     elif args.cmd == "ingest-api":
         if args.provider == "spoonacular":
             items = asyncio.run(spoonacular_search(args.query, number=args.n))
@@ -100,12 +166,41 @@ def main():
         for r in results: print(f"Saved: {r['title']}  -> {r['path']}")
         print(f"\nManifest written to {args.out}/manifest.json")
     elif args.cmd == "ebooks-ingest":
-        added = ingest_manifest_to_dishes(args.manifest, data_dir=args.data_dir, max_books=args.max_books, max_lines=args.max_lines)
+        added = ingest_manifest_to_dishes(args.manifest, data_dir=args.data_dir, max_books=args.max_books, max_lines=args.max_lines, workers=args.workers)
         print(f"Added {added} dishes into {args.data_dir}/dishes.xlsx")
+    elif args.cmd == "catalog-import":
+        with DishStore(args.xlsx) as store:
+            n = import_dishes_xlsx(store, args.xlsx)
+            print(f"Imported {n} rows; catalog now holds {store.count()} dishes")
+    elif args.cmd == "catalog-export":
+        n = export_dishes_xlsx(f"{args.data_dir}/dishes.xlsx", args.out)
+        print(f"Exported {n} dishes to {args.out}")
+    elif args.cmd == "compact":
+        path = f"{args.data_dir}/dishes.xlsx"
+        print(f"Journal holds {pending_count(path)} pending entries")
+        with DishStore(path) as store:
+            n = compact(store, path)
+        n_total = len(read_dishes(path))   # refreshes the Parquet snapshot
+        print(f"Folded {n} new dishes into the catalog ({n_total} total)")
+    elif args.cmd == "catalog-search":
+        with open_store(f"{args.data_dir}/dishes.xlsx") as store:
+            for d in store.search(args.query, limit=args.n):
+                print(f"- {d.name} ({d.meal_type}) {', '.join(t for t in d.tags if ':' in t)}")
+    elif args.cmd == "text-cache":
+        if args.action == "prune":
+            keep = None
+            if args.current_only:
+                keep = [PDF_EXTRACTOR]
+                try: keep.append(ocr_extractor())
+                except Exception: pass   # no tesseract here; its entries can't be current
+            max_bytes = int(args.max_mb * 2**20) if args.max_mb is not None else None
+            n, freed = text_cache.prune(args.older_than_days, max_bytes, keep)
+            print(f"Removed {n} entries ({freed/2**20:.1f} MiB)")
+        st = text_cache.stats()
+        print(f"{st['dir']}: {st['entries']} entries, {st['pages']} pages, {st['bytes']/2**20:.1f} MiB")
+        for ex, e in sorted(st["extractors"].items()):
+            print(f"  {ex}: {e['entries']} entries, {e['bytes']/2**20:.1f} MiB")
     elif args.cmd == "enhance-videos":
-        from .io_xls import read_dishes, write_dishes
-        import asyncio
-        
         print(f"🎥 Enhancing recipes with YouTube videos...")
         dishes = read_dishes(f"{args.data_dir}/dishes.xlsx")[:args.max_recipes]
         
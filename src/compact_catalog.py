@@ -0,0 +1,116 @@
+"""
+Compact In-Memory Catalog for Nigela
+Struct-of-arrays view of the dish catalog: interned tag/ingredient/unit vocabularies, tags and
+ingredients as CSR integer arrays, numeric fields in NumPy arrays and text in Arrow buffers.
+Indexing returns ordinary Dish objects, so planners and email/card renderers don't change.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from .models import Dish, Ingredient
+from .catalog import dishes_to_table
+
+def _encode(arr: pa.Array, fill: str = "") -> Tuple[List[str], np.ndarray]:
+    """Intern a string column: (vocabulary, int32 code per row)"""
+    enc = pc.dictionary_encode(pc.fill_null(arr, fill))
+    if isinstance(enc, pa.ChunkedArray): enc = enc.combine_chunks()
+    return enc.dictionary.to_pylist(), enc.indices.to_numpy(zero_copy_only=False).astype(np.int32)
+
+def _csr(lists: pa.Array) -> Tuple[np.ndarray, pa.Array]:
+    """Row pointers (rebased to 0) and flattened values of a list column"""
+    offsets = lists.offsets.to_numpy().astype(np.int64)
+    return offsets - offsets[0], lists.flatten()
+
+class CompactCatalog:
+    __slots__ = ("names", "meal_vocab", "meal", "cook_minutes", "difficulty", "rarity_vocab", "rarity",
+                 "tag_vocab", "tag_index", "tag_ptr", "tag_ids",
+                 "item_vocab", "item_index", "unit_vocab", "ing_ptr", "ing_item", "ing_qty", "ing_unit",
+                 "steps", "flavor_text", "public_url")
+
+    @classmethod
+    def from_table(cls, table: pa.Table) -> "CompactCatalog":
+        t = table.combine_chunks()
+        c = cls()
+        c.names = t.column("name").combine_chunks()
+        c.meal_vocab, c.meal = _encode(t.column("meal_type"))
+        c.cook_minutes = t.column("cook_minutes").to_numpy().astype(np.int16)
+        c.difficulty = t.column("difficulty").to_numpy().astype(np.int8)
+        c.rarity_vocab, c.rarity = _encode(t.column("rarity"), "common")
+
+        tags = t.column("tags").combine_chunks()
+        c.tag_ptr, flat = _csr(tags)
+        c.tag_vocab, c.tag_ids = _encode(flat)
+        c.tag_index = {tag: k for k, tag in enumerate(c.tag_vocab)}
+
+        ings = t.column("ingredients").combine_chunks()
+        c.ing_ptr, flat = _csr(ings)
+        c.item_vocab, c.ing_item = _encode(flat.field("item"))
+        c.item_index = {item: k for k, item in enumerate(c.item_vocab)}
+        c.unit_vocab, c.ing_unit = _encode(flat.field("unit"))
+        c.ing_qty = pc.fill_null(flat.field("qty"), 0.0).to_numpy(zero_copy_only=False)
+
+        c.steps = t.column("steps").combine_chunks()
+        c.flavor_text = pc.dictionary_encode(t.column("flavor_text")).combine_chunks()
+        c.public_url = t.column("public_url").combine_chunks()
+        return c
+
+    @classmethod
+    def from_dishes(cls, dishes: List[Dish]) -> "CompactCatalog":
+        return cls.from_table(dishes_to_table(dishes))
+
+    def __len__(self) -> int:
+        return len(self.meal)
+
+    def __getitem__(self, i: int) -> Dish:
+        return self.dish(i)
+
+    def __iter__(self) -> Iterator[Dish]:
+        return (self.dish(i) for i in range(len(self)))
+
+    # ---------- Dish views ----------
+    def dish_tags(self, i: int) -> List[str]:
+        vocab = self.tag_vocab
+        return [vocab[t] for t in self.tag_ids[self.tag_ptr[i]:self.tag_ptr[i+1]].tolist()]
+
+    def dish_ingredients(self, i: int) -> List[Ingredient]:
+        a, b = self.ing_ptr[i], self.ing_ptr[i+1]
+        items, units = self.item_vocab, self.unit_vocab
+        return [Ingredient(items[it], q, units[u]) for it, q, u in
+                zip(self.ing_item[a:b].tolist(), self.ing_qty[a:b].tolist(), self.ing_unit[a:b].tolist())]
+
+    def name(self, i: int) -> str:
+        return self.names[i].as_py()
+
+    def dish(self, i: int) -> Dish:
+        """Materialize row i as a fresh Dish (safe to mutate; the catalog is not touched)"""
+        i = int(i)
+        return Dish(
+            name=self.name(i), meal_type=self.meal_vocab[self.meal[i]], tags=self.dish_tags(i),
+            cook_minutes=int(self.cook_minutes[i]), difficulty=int(self.difficulty[i]),
+            ingredients=self.dish_ingredients(i), steps=self.steps[i].as_py() or [],
+            flavor_text=self.flavor_text[i].as_py(), rarity=self.rarity_vocab[self.rarity[i]],
+            public_url=self.public_url[i].as_py(),
+        )
+
+    def dishes(self, ids: Iterable[int]) -> List[Dish]:
+        return [self.dish(i) for i in ids]
+
+    # ---------- lookups ----------
+    def tag_id(self, tag: str) -> int:
+        """Vocabulary id of a tag, or -1 when no dish carries it"""
+        return self.tag_index.get(tag, -1)
+
+    def has_tag(self, i: int, tag: str) -> bool:
+        t = self.tag_index.get(tag)
+        return t is not None and bool((self.tag_ids[self.tag_ptr[i]:self.tag_ptr[i+1]] == t).any())
+
+    def nbytes(self) -> Dict[str, int]:
+        """Approximate buffer sizes per field (vocabularies excluded)"""
+        sizes = {}
+        for f in self.__slots__:
+            v = getattr(self, f)
+            if isinstance(v, np.ndarray): sizes[f] = v.nbytes
+            elif isinstance(v, pa.Array): sizes[f] = v.nbytes
+        return sizes
@@ -21,3 +21,6 @@ SMTP_PASS = os.getenv("SMTP_PASS","")
 EMAIL_FROM = os.getenv("EMAIL_FROM","Nigela <noreply@example.com>")
 EMAIL_TO = os.getenv("EMAIL_TO","").strip()
 TIMEZONE = os.getenv("TIMEZONE","Asia/Kolkata")
+
+# Extracted PDF/OCR text, keyed by file SHA-256 + extractor version ("" disables the cache)
+TEXT_CACHE_DIR = os.getenv("NIGELA_TEXT_CACHE","data/text_cache")
@@ -9,7 +9,7 @@ from typing import List, Dict, Any
 import json
 from .models import Dish, Ingredient
 from .llm import parse_dish_with_ai
-from .io_xls import read_dishes, write_dishes
+from .io_xls import open_store
 
 class CookbookProcessor:
     def __init__(self, library_dir="library", data_dir="data"):
@@ -251,32 +251,30 @@ class CookbookProcessor:
         dishes_file = self.data_dir / "dishes.xlsx"
         
         try:
-            # Read existing dishes
-            existing_dishes = read_dishes(str(dishes_file))
-            print(f"📚 Found {len(existing_dishes)} existing dishes")
-            
-            # Check for duplicates by name
-            existing_names = {dish.name.lower() for dish in existing_dishes}
-            new_unique_recipes = []
-            
-            for recipe in new_recipes:
-                if recipe.name.lower() not in existing_names:
-                    new_unique_recipes.append(recipe)
-                else:
-                    print(f"⚠️ Skipping duplicate: {recipe.name}")
-            
-            if new_unique_recipes:
-                # Combine and save
-                combined_dishes = existing_dishes + new_unique_recipes
-                write_dishes(str(dishes_file), combined_dishes)
+            with open_store(dishes_file) as store:
+                print(f"📚 Found {store.count()} existing dishes")
+                
+                # Check for duplicates by name (indexed lookup, no full catalog load)
+                existing_names = store.existing_names(recipe.name for recipe in new_recipes)
+                new_unique_recipes = []
                 
-                print(f"✅ Added {len(new_unique_recipes)} new recipes to database")
-                print(f"📊 Total recipes in database: {len(combined_dishes)}")
+                for recipe in new_recipes:
+                    if recipe.name.lower().strip() not in existing_names:
+                        new_unique_recipes.append(recipe)
+                        existing_names.add(recipe.name.lower().strip())
+                    else:
+                        print(f"⚠️ Skipping duplicate: {recipe.name}")
                 
-                return len(new_unique_recipes)
-            else:
-                print("ℹ️ No new unique recipes to add")
-                return 0
+                if new_unique_recipes:
+                    added = store.add_dishes(new_unique_recipes)
+                    
+                    print(f"✅ Added {added} new recipes to database")
+                    print(f"📊 Total recipes in database: {store.count()}")
+                    
+                    return added
+                else:
+                    print("ℹ️ No new unique recipes to add")
+                    return 0
                 
         except Exception as e:
             print(f"⚠️ Error integrating with database: {e}")
@@ -0,0 +1,86 @@
+"""
+Whole-Day Plan Optimizer for Nigela
+Branch-and-bound over every slot of a day at once: the day's dishes must fit the pantry together,
+no dish is served twice, and total cook time can be capped. Returns the best plan found within a
+time budget. The first plan it reaches is the greedy slot-by-slot plan under the same constraints,
+so a short budget still returns a feasible day.
+"""
+
+import time
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import numpy as np
+from .scoring import CatalogScorer, PANTRY_MISS
+
+class _Stop(Exception):
+    pass
+
+def optimize_slots(scorer: CatalogScorer, slots: Sequence[Tuple[Hashable, np.ndarray]], stock: Dict[str, dict],
+                   used_names: set[str], budget_ms: int = 200,
+                   max_cook_minutes: Optional[int] = None) -> Tuple[Dict[Hashable, int], bool]:
+    """Pick a catalog id for each (key, candidate ids) slot, maximizing the summed score().
+    An unfilled slot counts as a pantry miss. Returns ({key: dish id}, proved_optimal)."""
+    deadline = time.perf_counter() + budget_ms / 1000
+    catalog = scorer.catalog
+    ok, used = scorer.pantry_ok(stock), scorer.used_mask(used_names)
+
+    # per slot: candidates that fit the pantry on their own, best score first (catalog order on ties)
+    options: List[Tuple[List[int], List[float]]] = []
+    for _, ids in slots:
+        ids = np.asarray(ids, dtype=np.int64)
+        s = scorer.scores(ids, ok, used)
+        keep = s > PANTRY_MISS
+        ids, s = ids[keep], s[keep]
+        order = np.argsort(-s, kind="stable")
+        options.append((ids[order].tolist(), s[order].tolist()))
+
+    # optimistic value of slots k.. : each takes its top candidate
+    bound = [0.0] * (len(slots) + 1)
+    for k in range(len(slots) - 1, -1, -1):
+        bound[k] = bound[k+1] + (options[k][1][0] if options[k][1] else PANTRY_MISS)
+
+    info: Dict[int, Tuple[str, int, List[Tuple[str, float]]]] = {}
+    def dish_info(i: int):
+        if i not in info:
+            a, b = catalog.ing_ptr[i], catalog.ing_ptr[i+1]
+            need: Dict[str, float] = {}
+            for it, q in zip(catalog.ing_item[a:b].tolist(), catalog.ing_qty[a:b].tolist()):
+                key = scorer.item_keys[it]
+                if key and q == q and q > 0:
+                    need[key] = need.get(key, 0.0) + q
+            info[i] = (catalog.name(i).lower(), int(catalog.cook_minutes[i]), list(need.items()))
+        return info[i]
+
+    remaining = {k: float(v.get("qty", 0) or 0) for k, v in stock.items()}
+    names: set[str] = set()
+    path: List[Optional[int]] = [None] * len(slots)
+    best = {"score": -np.inf, "path": list(path)}
+    nodes = [0]
+
+    def dfs(k: int, total: float, minutes: int):
+        if total + bound[k] <= best["score"]: return
+        if k == len(slots):
+            best["score"], best["path"] = total, list(path)
+            if total >= bound[0]: raise _Stop   # every slot got its top candidate
+            return
+        nodes[0] += 1
+        if not nodes[0] & 255 and time.perf_counter() > deadline: raise _Stop
+        for i, s in zip(*options[k]):
+            if total + s + bound[k+1] <= best["score"]: break   # sorted: nothing later can do better
+            name, m, need = dish_info(i)
+            if name in names: continue
+            if max_cook_minutes is not None and minutes + m > max_cook_minutes: continue
+            if any(remaining.get(it, 0.0) < q for it, q in need): continue
+            saved = [(it, remaining.get(it, 0.0)) for it, _ in need]
+            for it, q in need: remaining[it] = remaining.get(it, 0.0) - q
+            names.add(name); path[k] = i
+            dfs(k + 1, total + s, minutes + m)
+            names.discard(name); path[k] = None
+            for it, q in saved: remaining[it] = q
+        dfs(k + 1, total + PANTRY_MISS, minutes)
+
+    try:
+        dfs(0, 0.0, 0)
+        proved = True
+    except _Stop:
+        proved = best["score"] >= bound[0]
+    return {key: i for (key, _), i in zip(slots, best["path"]) if i is not None}, proved
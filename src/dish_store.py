@@ -0,0 +1,191 @@
+"""
+SQLite Dish Store for Nigela
+Normalized dishes/ingredients/tags/steps tables with meal and tag indexes plus FTS5 search
+"""
+
+import json, sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .models import Dish, Ingredient
+
+STORE_FILE = "dishes.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dishes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    meal_type TEXT NOT NULL,
+    cook_minutes INTEGER NOT NULL DEFAULT 20,
+    difficulty INTEGER NOT NULL DEFAULT 2,
+    flavor_text TEXT,
+    rarity TEXT DEFAULT 'common',
+    public_url TEXT,
+    UNIQUE (name_key, meal_type)
+);
+CREATE INDEX IF NOT EXISTS idx_dishes_meal ON dishes(meal_type);
+CREATE INDEX IF NOT EXISTS idx_dishes_name ON dishes(name_key);
+CREATE TABLE IF NOT EXISTS ingredients (
+    dish_id INTEGER NOT NULL REFERENCES dishes(id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    qty REAL NOT NULL DEFAULT 0,
+    unit TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (dish_id, pos)
+);
+CREATE INDEX IF NOT EXISTS idx_ingredients_item ON ingredients(item);
+CREATE TABLE IF NOT EXISTS tags (
+    dish_id INTEGER NOT NULL REFERENCES dishes(id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (dish_id, pos)
+);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag, dish_id);
+CREATE TABLE IF NOT EXISTS steps (
+    dish_id INTEGER NOT NULL REFERENCES dishes(id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (dish_id, pos)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS dish_fts USING fts5(name, items);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def store_path(path) -> Path:
+    """dishes.db next to a dishes.xlsx/dishes.parquet (or the path itself)"""
+    p = Path(path)
+    return p if p.suffix == ".db" else p.with_name(STORE_FILE)
+
+def dish_key(d: Dish) -> Tuple[str, str]:
+    return (d.name.lower().strip(), d.meal_type.lower().strip())
+
+def _fts_query(text: str) -> str:
+    # quote every token so user input can't trip FTS5 syntax; prefix-match the lot
+    toks = [t.replace('"', '') for t in (text or "").split()]
+    return " ".join(f'"{t}"*' for t in toks if t)
+
+class DishStore:
+    def __init__(self, path):
+        self.path = store_path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.con = sqlite3.connect(str(self.path))
+        self.con.execute("PRAGMA foreign_keys = ON")
+        self.con.executescript(_SCHEMA)
+        # journal entries not yet compacted into the tables; reads merge them in (see ingest_journal)
+        self.pending: List[Dish] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.con.close()
+
+    # ---------- meta ----------
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self.con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value):
+        self.con.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def version(self) -> int:
+        """Bumped once per write transaction that changed the catalog"""
+        return int(self.get_meta("catalog_version", "0"))
+
+    def count(self) -> int:
+        return self.con.execute("SELECT COUNT(*) FROM dishes").fetchone()[0] + len(self.pending)
+
+    # ---------- writes ----------
+    def add_dishes(self, dishes: Iterable[Dish], replace: bool = False) -> int:
+        """Insert dishes in one transaction; existing (name, meal_type) rows are kept unless replace=True.
+        Returns the number of dishes inserted or replaced."""
+        n = 0
+        with self.con:
+            for d in dishes:
+                key, meal = dish_key(d)
+                row = self.con.execute("SELECT id FROM dishes WHERE name_key = ? AND meal_type = ?", (key, meal)).fetchone()
+                if row and not replace: continue
+                vals = (d.name, key, meal, int(d.cook_minutes), int(d.difficulty), d.flavor_text, d.rarity or "common", d.public_url)
+                if row:
+                    dish_id = row[0]
+                    for table in ("ingredients", "tags", "steps"):
+                        self.con.execute(f"DELETE FROM {table} WHERE dish_id = ?", (dish_id,))
+                    self.con.execute("DELETE FROM dish_fts WHERE rowid = ?", (dish_id,))
+                    self.con.execute("UPDATE dishes SET name=?, name_key=?, meal_type=?, cook_minutes=?, difficulty=?, "
+                                     "flavor_text=?, rarity=?, public_url=? WHERE id = ?", vals + (dish_id,))
+                else:
+                    dish_id = self.con.execute("INSERT INTO dishes(name, name_key, meal_type, cook_minutes, difficulty, "
+                                               "flavor_text, rarity, public_url) VALUES (?,?,?,?,?,?,?,?)", vals).lastrowid
+                self.con.executemany("INSERT INTO ingredients(dish_id, pos, item, qty, unit) VALUES (?,?,?,?,?)",
+                                     [(dish_id, k, i.item, float(i.qty or 0), i.unit or "") for k, i in enumerate(d.ingredients)])
+                self.con.executemany("INSERT INTO tags(dish_id, pos, tag) VALUES (?,?,?)",
+                                     [(dish_id, k, t) for k, t in enumerate(d.tags or [])])
+                self.con.executemany("INSERT INTO steps(dish_id, pos, text) VALUES (?,?,?)",
+                                     [(dish_id, k, s) for k, s in enumerate(d.steps or [])])
+                self.con.execute("INSERT INTO dish_fts(rowid, name, items) VALUES (?,?,?)",
+                                 (dish_id, d.name, " ".join(i.item for i in d.ingredients if i.item)))
+                n += 1
+            if n:
+                self.set_meta("catalog_version", self.version + 1)
+        return n
+
+    # ---------- reads ----------
+    def _hydrate(self, ids: Optional[List[int]] = None) -> List[Dish]:
+        """Build Dish objects for ids (in the given order), or for the whole catalog when ids is None"""
+        if ids is None:
+            where, args = "", ()
+        else:
+            if not ids: return []
+            where, args = "WHERE dish_id IN (SELECT value FROM json_each(?))", (json.dumps(ids),)
+        tags: Dict[int, List[str]] = {}
+        for dish_id, tag in self.con.execute(f"SELECT dish_id, tag FROM tags {where} ORDER BY dish_id, pos", args):
+            tags.setdefault(dish_id, []).append(tag)
+        ings: Dict[int, List[Ingredient]] = {}
+        for dish_id, item, qty, unit in self.con.execute(f"SELECT dish_id, item, qty, unit FROM ingredients {where} ORDER BY dish_id, pos", args):
+            ings.setdefault(dish_id, []).append(Ingredient(item, qty, unit))
+        steps: Dict[int, List[str]] = {}
+        for dish_id, text in self.con.execute(f"SELECT dish_id, text FROM steps {where} ORDER BY dish_id, pos", args):
+            steps.setdefault(dish_id, []).append(text)
+        rows = self.con.execute(
+            "SELECT id, name, meal_type, cook_minutes, difficulty, flavor_text, rarity, public_url FROM dishes "
+            + where.replace("dish_id", "id") + " ORDER BY id", args)
+        by_id = {
+            r[0]: Dish(name=r[1], meal_type=r[2], tags=tags.get(r[0], []), cook_minutes=r[3], difficulty=r[4],
+                       ingredients=ings.get(r[0], []), steps=steps.get(r[0], []), flavor_text=r[5],
+                       rarity=r[6] or "common", public_url=r[7])
+            for r in rows
+        }
+        return list(by_id.values()) if ids is None else [by_id[i] for i in ids if i in by_id]
+
+    def all_dishes(self, include_pending: bool = True) -> List[Dish]:
+        return self._hydrate() + (self.pending if include_pending else [])
+
+    def search(self, query: str, limit: int = 20) -> List[Dish]:
+        """Full-text search over dish names and ingredient items, best matches first"""
+        q = _fts_query(query)
+        if not q: return []
+        ids = [r[0] for r in self.con.execute("SELECT rowid FROM dish_fts WHERE dish_fts MATCH ? ORDER BY rank LIMIT ?", (q, limit))]
+        toks = query.lower().split()
+        extra = [d for d in self.pending
+                 if all(t in (d.name + " " + " ".join(i.item for i in d.ingredients)).lower() for t in toks)]
+        return (self._hydrate(ids) + extra)[:limit]
+
+    def existing_names(self, names: Iterable[str]) -> Set[str]:
+        """Lower-cased names (any meal type) already in the catalog"""
+        keys = list({(n or "").lower().strip() for n in names})
+        found = set()
+        for k in range(0, len(keys), 500):
+            chunk = keys[k:k+500]
+            q = f"SELECT DISTINCT name_key FROM dishes WHERE name_key IN ({','.join('?' * len(chunk))})"
+            found.update(r[0] for r in self.con.execute(q, chunk))
+        return found | {d.name.lower().strip() for d in self.pending}
+
+    def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """(name_key, meal_type) pairs already in the catalog, via the UNIQUE index"""
+        found = {k for k in set(keys)
+                 if self.con.execute("SELECT 1 FROM dishes WHERE name_key = ? AND meal_type = ?", k).fetchone()}
+        return found | {dish_key(d) for d in self.pending}
@@ -3,8 +3,9 @@ from pathlib import Path
 from typing import Optional, List
 from .parse_pdf import pdf_to_text
 from .normalize import text_to_dishes
+from . import keyword_matcher
 from .io_xls import write_dishes
-from .llm import parse_recipe_block_batch, classify_titles, to_dishes, embed_for_dedup
+from .llm import BlockStats, parse_recipe_block_batch, classify_titles, to_dishes, embed_for_dedup
 
 CUISINE_HINTS = {
     "gujarati":["gujarat","gujarati","kathiawar","surati"],
@@ -21,15 +22,14 @@ CUISINE_HINTS = {
     "burmese":["burmese","myanmar","khow suey","ohn no khao swe"],
     "indian chinese":["indo chinese","indian chinese","hakka","schezwan"],
 }
+keyword_matcher.register("cuisine", CUISINE_HINTS)
 
 def infer_cuisine(title: str) -> Optional[str]:
-    t = (title or "").lower()
-    for k,hints in CUISINE_HINTS.items():
-        if any(h in t for h in hints): return k
-    return None
+    hit = keyword_matcher.match((title or "").lower()).get("cuisine", ())
+    return next((k for k in CUISINE_HINTS if k in hit), None)
 
 def ingest_manifest_to_dishes(manifest_path: str, data_dir="data", meal_hint_default="dinner",
-                              max_books: int = 20, max_lines: Optional[int] = 12000) -> int:
+                              max_books: int = 20, max_lines: Optional[int] = 12000, workers: int = 1) -> int:
     mpath = Path(manifest_path)
     if not mpath.exists():
         print(f"Manifest not found: {manifest_path}")
@@ -43,15 +43,18 @@ def ingest_manifest_to_dishes(manifest_path: str, data_dir="data", meal_hint_def
         pdf_path = b.get("path"); title = b.get("title") or ""
         if not pdf_path or not Path(pdf_path).exists(): continue
         cuisine_hint = infer_cuisine(title)
-        raw = pdf_to_text(pdf_path)
+        raw = pdf_to_text(pdf_path, workers)
         if max_lines: raw = "\n".join(raw.splitlines()[:max_lines])
         # chunk on blank lines, keep only 200–2500 char blocks
         for ch in [c.strip() for c in raw.split("\n\n") if c.strip()]:
             if 200 <= len(ch) <= 2500:
                 raw_blocks.append(ch); meta.append({"title": title, "cuisine_hint": cuisine_hint})
 
-    # 2) Structured parse with OpenAI (JSON schema; Jain/veg enforced)
-    parsed = parse_recipe_block_batch(raw_blocks, meal_hint_default, [m["cuisine_hint"] for m in meta])
+    # 2) Structured parse: rule-based for clean blocks, OpenAI (JSON schema; Jain/veg enforced) for the rest
+    stats = BlockStats()
+    parsed = parse_recipe_block_batch(raw_blocks, meal_hint_default, [m["cuisine_hint"] for m in meta], stats)
+    print(f"{len(raw_blocks)} blocks: {stats.local} parsed locally, {stats.llm} via LLM, {stats.failed} failed "
+          f"({stats.avoided:.0%} of LLM calls avoided)")
 
     # 3) If any items have only title-like strings, run classifier
     titles = [p.get("name","") for p in parsed]
@@ -3,6 +3,7 @@ from typing import List
 from .models import Dish, Ingredient
 from .config import SPOONACULAR_API_KEY, EDAMAM_APP_ID, EDAMAM_APP_KEY
 from .normalize import guess_tags
+from .ingredient_parser import parse_ingredient
 
 async def spoonacular_search(query: str, number: int = 5):
     if not SPOONACULAR_API_KEY: return []
@@ -45,7 +46,7 @@ def map_edamam(items, meal_hint=None, cuisine_hint=None) -> List[Dish]:
         name = (it.get("label") or "").strip()
         if not name: continue
         tags = guess_tags(name, meal_hint, cuisine_hint)
-        ings = [Ingredient(str(x), 0, "") for x in (it.get("ingredientLines") or [])]
+        ings = [parse_ingredient(str(x)) for x in (it.get("ingredientLines") or [])]
         out.append(Dish(
             name=name, meal_type=(meal_hint or "dinner"), tags=tags,
             cook_minutes=20, difficulty=2,
@@ -0,0 +1,111 @@
+"""
+Append-only Ingest Journal for Nigela
+Ingest commands append new dishes as JSON lines in O(batch); readers overlay the journal on the
+dish store, and compaction folds it into the store in a single transaction
+"""
+
+import json, os, threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+from .models import Dish, Ingredient
+from .dish_store import DishStore
+
+JOURNAL_FILE = "dishes.journal.jsonl"
+COMPACT_AT = 5000   # journal entries before write_dishes kicks off a background compaction
+
+try:
+    import fcntl
+except ImportError:   # Windows: appends are still line-atomic enough for a single writer
+    fcntl = None
+
+def journal_path(path) -> Path:
+    p = Path(path)
+    return p if p.name == JOURNAL_FILE else p.with_name(JOURNAL_FILE)
+
+def _compacting_path(path) -> Path:
+    return journal_path(path).with_suffix(".compacting")
+
+def dish_to_record(d: Dish) -> dict:
+    return {"name": d.name, "meal_type": d.meal_type, "tags": list(d.tags or []),
+            "cook_minutes": int(d.cook_minutes), "difficulty": int(d.difficulty),
+            "ingredients": [{"item": i.item, "qty": float(i.qty or 0), "unit": i.unit} for i in d.ingredients],
+            "steps": list(d.steps or []), "flavor_text": d.flavor_text, "rarity": d.rarity or "common",
+            "public_url": d.public_url}
+
+def record_to_dish(r: dict) -> Dish:
+    return Dish(name=r["name"], meal_type=r["meal_type"], tags=r.get("tags") or [],
+                cook_minutes=int(r.get("cook_minutes", 20)), difficulty=int(r.get("difficulty", 2)),
+                ingredients=[Ingredient(i.get("item", ""), float(i.get("qty") or 0), i.get("unit", "")) for i in r.get("ingredients") or []],
+                steps=r.get("steps") or [], flavor_text=r.get("flavor_text"), rarity=r.get("rarity") or "common",
+                public_url=r.get("public_url"))
+
+def append(path, dishes: Iterable[Dish]) -> int:
+    """Append a batch as one fsync'd write; concurrent ingesters are serialized with flock"""
+    lines = [json.dumps(dish_to_record(d), ensure_ascii=False) + "\n" for d in dishes]
+    if not lines: return 0
+    jp = journal_path(path)
+    jp.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        f = open(jp, "a", encoding="utf-8")
+        if fcntl: fcntl.flock(f, fcntl.LOCK_EX)
+        # compaction may have renamed the file while we waited for the lock; follow the path
+        try: same = os.fstat(f.fileno()).st_ino == os.stat(jp).st_ino
+        except FileNotFoundError: same = False
+        if same: break
+        f.close()
+    with f:
+        f.write("".join(lines))
+        f.flush(); os.fsync(f.fileno())
+    return len(lines)
+
+def _read_file(p: Path) -> List[Dish]:
+    out = []
+    if not p.exists(): return out
+    with open(p, encoding="utf-8") as f:
+        for line in f:
+            try:
+                out.append(record_to_dish(json.loads(line)))
+            except (ValueError, KeyError):
+                continue   # torn trailing line from a crash mid-append
+    return out
+
+def read_journal(path) -> List[Dish]:
+    """Pending dishes, including a batch that was mid-compaction when the process died"""
+    return _read_file(_compacting_path(path)) + _read_file(journal_path(path))
+
+def pending_count(path) -> int:
+    n = 0
+    for p in (_compacting_path(path), journal_path(path)):
+        if p.exists():
+            with open(p, "rb") as f:
+                n += sum(1 for _ in f)
+    return n
+
+def compact(store, path) -> int:
+    """Fold the journal into the store. The live journal is renamed first so ingests can keep
+    appending; re-running after a crash is safe because the store skips keys it already holds."""
+    jp, cp = journal_path(path), _compacting_path(path)
+    n = 0
+    while cp.exists() or jp.exists():
+        if not cp.exists():
+            with open(jp, "a") as f:
+                if fcntl: fcntl.flock(f, fcntl.LOCK_EX)
+                jp.replace(cp)
+        dishes = _read_file(cp)
+        n += store.add_dishes(dishes) if dishes else 0
+        cp.unlink()
+    return n
+
+_compaction: Optional[threading.Thread] = None
+
+def compact_in_background(path) -> Optional[threading.Thread]:
+    """Start a compaction thread unless one is already running. Not a daemon, so a CLI run
+    finishes the fold before the interpreter exits."""
+    global _compaction
+    if _compaction and _compaction.is_alive(): return None
+    def run():
+        with DishStore(path) as store:
+            compact(store, path)
+    _compaction = threading.Thread(target=run, name="nigela-compact")
+    _compaction.start()
+    return _compaction
@@ -0,0 +1,201 @@
+"""
+Rule-based Ingredient Parser for Nigela
+Quantity / unit / item lines ("1 1/2 cups rice", "jeera - 1 tsp", "2-3 hari mirch", "namak to taste")
+parsed with patterns compiled once at import. Fractions, unicode fractions, ranges (midpoint),
+number words, Indian household units (katori, chutki, chamach) and common Hindi ingredient names
+are folded into the units and item names the pantry uses.
+
+parse_block() turns a whole recipe block into the same dict the LLM parser returns, but only when
+every signal is clean (a title, mostly parseable ingredient lines, nothing non-Jain); anything else
+returns None and goes to the model.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional
+from .models import Ingredient
+
+UNITS: Dict[str, str] = {}
+for canon, aliases in {
+    "cup": ["cup", "cups", "c"],
+    "tbsp": ["tbsp", "tbsps", "tbs", "tbl", "tablespoon", "tablespoons", "table spoon", "table spoons", "bada chamach", "bada chammach"],
+    "tsp": ["tsp", "tsps", "teaspoon", "teaspoons", "tea spoon", "tea spoons", "chhota chamach", "chota chamach", "chamach", "chammach", "spoon", "spoons"],
+    "g": ["g", "gm", "gms", "gr", "gram", "grams", "gramme", "grammes"],
+    "kg": ["kg", "kgs", "kilo", "kilos", "kilogram", "kilograms"],
+    "ml": ["ml", "mls", "millilitre", "millilitres", "milliliter", "milliliters"],
+    "l": ["l", "ltr", "ltrs", "litre", "litres", "liter", "liters"],
+    "oz": ["oz", "ounce", "ounces"],
+    "lb": ["lb", "lbs", "pound", "pounds"],
+    "pinch": ["pinch", "pinches", "chutki", "chuttki"],
+    "katori": ["katori", "katoris", "vati", "wati", "bowl", "bowls"],
+    "glass": ["glass", "glasses"],
+    "handful": ["handful", "handfuls", "mutthi", "muththi", "mutti"],
+    "clove": ["clove", "cloves"],
+    "pc": ["pc", "pcs", "piece", "pieces", "nos", "no", "number", "numbers"],
+    "inch": ["inch", "inches", "in"],
+    "bunch": ["bunch", "bunches", "gaddi"],
+    "sprig": ["sprig", "sprigs"],
+    "stick": ["stick", "sticks"],
+    "slice": ["slice", "slices"],
+    "can": ["can", "cans", "tin", "tins"],
+    "packet": ["packet", "packets", "pack", "packs"],
+    "drop": ["drop", "drops"],
+    "dash": ["dash", "dashes"],
+}.items():
+    for a in aliases: UNITS[a] = canon
+
+# Hindi / Gujarati / Marathi names -> the names used in the pantry and the catalog
+ITEM_NAMES: Dict[str, str] = {
+    "jeera": "cumin", "zeera": "cumin", "haldi": "turmeric", "dhania": "coriander", "dhaniya": "coriander",
+    "namak": "salt", "cheeni": "sugar", "chini": "sugar", "shakkar": "sugar", "gud": "jaggery", "gur": "jaggery",
+    "dahi": "curd", "doodh": "milk", "tel": "oil", "atta": "wheat flour", "gehun ka atta": "wheat flour",
+    "maida": "all-purpose flour", "suji": "semolina", "sooji": "semolina", "rava": "semolina", "rawa": "semolina",
+    "chawal": "rice", "chaval": "rice", "hing": "asafoetida", "heeng": "asafoetida", "rai": "mustard seeds",
+    "sarson": "mustard seeds", "til": "sesame", "kaju": "cashew", "badam": "almond", "kishmish": "raisins",
+    "elaichi": "cardamom", "laung": "clove", "dalchini": "cinnamon", "ajwain": "carom seeds", "saunf": "fennel seeds",
+    "imli": "tamarind", "nariyal": "coconut", "moongphali": "peanuts", "mungfali": "peanuts", "shengdana": "peanuts",
+    "palak": "spinach", "tamatar": "tomato", "aloo": "potato", "batata": "potato", "pyaz": "onion", "pyaaz": "onion",
+    "kanda": "onion", "lehsun": "garlic", "lasun": "garlic", "adrak": "ginger", "nimbu": "lemon", "limbu": "lemon",
+    "matar": "peas", "gajar": "carrot", "lauki": "bottle gourd", "doodhi": "bottle gourd", "kaddu": "pumpkin",
+    "mirch": "chili", "hari mirch": "green chili", "lal mirch": "red chili", "lal mirch powder": "red chili powder",
+    "kadi patta": "curry leaves", "kadhi patta": "curry leaves", "curry patta": "curry leaves", "pani": "water",
+    "tuvar dal": "toor dal", "arhar dal": "toor dal", "kabuli chana": "chickpeas",
+    "makhan": "butter", "malai": "cream", "kasuri methi": "dried methi",
+}
+# items that make a dish non-Jain (root vegetables, animal products); blocks naming them go to the model,
+# which also proposes substitutions
+NON_JAIN = {"onion", "garlic", "potato", "carrot", "beetroot", "beet", "radish", "ginger", "sweet potato", "yam",
+            "egg", "eggs", "chicken", "mutton", "fish", "meat", "prawn", "prawns", "shrimp", "gelatin", "honey", "mushroom", "mushrooms"}
+
+NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+                "eight": 8, "nine": 9, "ten": 10, "twelve": 12, "half": 0.5, "quarter": 0.25, "dozen": 12}
+FRACTIONS = {"½": 0.5, "¼": 0.25, "¾": 0.75, "⅓": 1/3, "⅔": 2/3, "⅛": 0.125, "⅜": 0.375, "⅝": 0.625, "⅞": 0.875}
+NO_QTY = r"to taste|as needed|as required|as per taste|for (?:garnish(?:ing)?|tempering|frying|greasing|cooking)|optional"
+SIZES = r"small|medium|large|big|heaped|heaping|level|rounded|generous"
+
+def _alt(words) -> str:
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+_Q = rf"(?:\d+\s+\d+\s*/\s*\d+|\d+\s*/\s*\d+|\d*\.\d+|\d+\s*[{''.join(FRACTIONS)}]|\d+|[{''.join(FRACTIONS)}]|(?:{_alt(NUMBER_WORDS)})\b)"
+_QTY = rf"(?P<qty>{_Q})(?:\s*(?:-|–|to|or)\s*(?P<qty2>{_Q}))?"
+_UNIT = rf"(?P<unit>{_alt(UNITS)})(?![a-z])\.?"
+BULLET = re.compile(r"^\s*(?:[-*•●·▪]+|\d+[.)](?=\s))?\s*")   # "1. " is a list marker, "1.5" a quantity
+QTY_FIRST = re.compile(rf"^{_QTY}\s*(?:(?:{SIZES})\s+)?(?:{_UNIT})?\s*(?:of\s+)?(?P<item>[^\d].*)$", re.I)
+ITEM_FIRST = re.compile(rf"^(?P<item>[^\d:–-][^:–-]*?)\s*(?::|-|–)\s*{_QTY}?\s*(?:(?:{SIZES})\s+)?(?:{_UNIT})?\s*(?P<rest>.*)$", re.I)
+UNIT_FIRST = re.compile(rf"^{_UNIT}\s+(?:of\s+)?(?P<item>[a-z].*)$", re.I)
+ITEM_NO_QTY = re.compile(rf"^(?P<item>[a-z][a-z ()'/-]*?)[\s,:-]*\(?(?:{NO_QTY})\)?\.?$", re.I)
+SECTION = re.compile(r"^(?P<head>ingredients?|you(?:'| wi)ll need|method|instructions?|directions?|preparation|steps?|how to make)\b\s*:?\s*(?P<rest>.*)$", re.I)
+MINUTES = re.compile(r"(\d+)\s*(?:min|mins|minutes)\b", re.I)
+WORD = re.compile(r"[a-z]+")
+
+def parse_quantity(text: Optional[str]) -> Optional[float]:
+    if not text: return None
+    s = text.strip().lower()
+    if s in NUMBER_WORDS: return float(NUMBER_WORDS[s])
+    if s[-1] in FRACTIONS:
+        whole = s[:-1].strip()
+        return (float(whole) if whole else 0.0) + FRACTIONS[s[-1]]
+    whole, _, frac = s.replace(" /", "/").replace("/ ", "/").rpartition(" ")
+    if "/" in frac:
+        num, den = frac.split("/")
+        return (float(whole) if whole else 0.0) + (float(num) / float(den) if float(den) else 0.0)
+    return float(s)
+
+def canonical_item(text: str) -> str:
+    """Lower-case, drop notes after a comma and parentheticals, map Hindi names ('jeera powder' -> 'cumin powder')"""
+    s = re.sub(r"\([^)]*\)", " ", text.lower()).split(",")[0]
+    s = re.sub(r"\s+", " ", s).strip(" .-:;")
+    if s in ITEM_NAMES: return ITEM_NAMES[s]
+    for k in sorted((k for k in ITEM_NAMES if " " in k), key=len, reverse=True):
+        if re.search(rf"\b{re.escape(k)}\b", s): s = re.sub(rf"\b{re.escape(k)}\b", ITEM_NAMES[k], s)
+    return " ".join(ITEM_NAMES.get(w, w) for w in s.split())
+
+class Parsed(NamedTuple):
+    ingredient: Ingredient
+    confident: bool
+
+def _amount(m: re.Match) -> float:
+    lo, hi = parse_quantity(m.group("qty")), parse_quantity(m.group("qty2"))
+    return (lo + hi) / 2 if lo is not None and hi is not None else (lo or 0.0)
+
+def parse_line(line: str) -> Parsed:
+    """Ingredient for one line. confident is False when the line didn't look like qty/unit/item
+    (the Ingredient then carries the whole line as item with qty 0, the old behaviour)."""
+    s = BULLET.sub("", str(line)).strip()
+    low = s.lower()
+    if not s or len(s.split()) > 12:
+        return Parsed(Ingredient(low, 0.0, ""), False)
+    m = QTY_FIRST.match(s)
+    if m and WORD.search(m.group("item").lower()):
+        unit = UNITS.get((m.group("unit") or "").lower(), "pc")
+        item = re.sub(rf"\b(?:{NO_QTY})\b", "", m.group("item"), flags=re.I)
+        return Parsed(Ingredient(canonical_item(item), _amount(m), unit), True)
+    m = UNIT_FIRST.match(s)
+    if m:   # "pinch of hing", "chutki haldi": one of the unit
+        return Parsed(Ingredient(canonical_item(m.group("item")), 1.0, UNITS[m.group("unit").lower()]), True)
+    m = ITEM_FIRST.match(s)
+    if m and (m.group("qty") or m.group("unit") or re.match(rf"\(?(?:{NO_QTY})", m.group("rest") or "", re.I)):
+        unit = UNITS.get((m.group("unit") or "").lower(), "pc" if m.group("qty") else "")
+        return Parsed(Ingredient(canonical_item(m.group("item")), _amount(m) if m.group("qty") else 0.0, unit), True)
+    m = ITEM_NO_QTY.match(s)
+    if m:
+        return Parsed(Ingredient(canonical_item(m.group("item")), 0.0, ""), True)
+    return Parsed(Ingredient(low, 0.0, ""), False)
+
+def parse_ingredient(line: str) -> Ingredient:
+    return parse_line(line).ingredient
+
+def parse_amount(text: str) -> Parsed:
+    """Quantity and unit of an amount with no item ('1/2 cup', '2 (optional)', 'to taste')"""
+    m = re.match(rf"^\s*{_QTY}\s*(?:(?:{SIZES})\s+)?(?:{_UNIT})?", text or "", re.I)
+    if not m or not m.group("qty"):
+        return Parsed(Ingredient("", 0.0, ""), bool(re.match(rf"\s*(?:{NO_QTY})", text or "", re.I)))
+    return Parsed(Ingredient("", _amount(m), UNITS.get((m.group("unit") or "").lower(), "pc")), True)
+
+def _non_jain(word: str) -> bool:
+    """'onions', 'potatoes', 'kanda' all count; plurals are trimmed and Hindi names mapped first"""
+    for w in (word, ITEM_NAMES.get(word, word)):
+        if w in NON_JAIN or (w.endswith("es") and w[:-2] in NON_JAIN) or (w.endswith("s") and w[:-1] in NON_JAIN):
+            return True
+    return False
+
+def is_jain(items: List[str]) -> bool:
+    return not any(_non_jain(item) or any(_non_jain(w) for w in WORD.findall(item)) for item in items)
+
+def parse_block(block: str, meal_hint: Optional[str] = None, cuisine_hint: Optional[str] = None,
+                min_hit_rate: float = 0.8) -> Optional[dict]:
+    """LLM-shaped recipe dict for a clean block (title line, ingredient lines, optional method), or
+    None when the block needs the model: no title, fewer than two ingredients, too many lines that
+    don't parse, or anything non-Jain anywhere in it (title, ingredients, method, stray lines), which
+    the model has to substitute."""
+    lines = [l.strip() for l in block.splitlines() if l.strip()]
+    if len(lines) < 3 or not is_jain([l.lower() for l in lines]): return None
+    title = BULLET.sub("", lines[0]).strip(" :#*")
+    if parse_line(title).confident or SECTION.match(title) or not (2 <= len(title) <= 60) or len(title.split()) > 8:
+        return None
+    ingredients, steps, misses, section = [], [], 0, None
+    for line in lines[1:]:
+        head = SECTION.match(line)
+        if head:
+            section = "steps" if head.group("head").lower()[:3] not in ("ing", "you") else "ing"
+            line = head.group("rest").strip()
+            if not line: continue
+        if section == "steps":
+            steps.append(BULLET.sub("", line)); continue
+        p = parse_line(line)
+        if p.confident:
+            ingredients.append(p.ingredient)
+        elif len(line.split()) >= 4 and section is None and ingredients:
+            section = "steps"; steps.append(BULLET.sub("", line))   # prose after the list: the method
+        else:
+            misses += 1
+    if len(ingredients) < 2 or len(ingredients) / (len(ingredients) + misses) < min_hit_rate:
+        return None
+    if not is_jain([i.item for i in ingredients]):   # parsed names too: Hindi words map after parsing
+        return None
+    minutes = MINUTES.search(block)
+    return {
+        "name": title, "meal_type": meal_hint or "dinner", "cuisine": cuisine_hint or "", "tags": [],
+        "cook_minutes": int(minutes.group(1)) if minutes else 20, "difficulty": 2,
+        "ingredients": [{"item": i.item, "qty": i.qty, "unit": i.unit} for i in ingredients],
+        "steps": steps, "notes": "", "jain_ok": True, "substitutions": [],
+    }
@@ -1,6 +1,18 @@
-import pandas as pd, json
-from typing import List
+import pandas as pd, pyarrow as pa, json
+from pathlib import Path
+from itertools import islice
+from typing import Iterable, Iterator, List
 from .models import Dish, Ingredient
+from .catalog import catalog_path, catalog_version, read_catalog, read_table, write_table, dishes_to_table, table_to_dishes, paused_gc
+from .compact_catalog import CompactCatalog
+from .dish_store import DishStore, dish_key
+from .ingest_journal import read_journal, append as journal_append, COMPACT_AT, compact_in_background
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 def read_pantry(path: str) -> dict:
     df = pd.read_excel(path, sheet_name=0)
@@ -13,57 +25,162 @@ def read_pantry(path: str) -> dict:
         }
     return stock
 
-def read_dishes(path: str) -> List[Dish]:
-    df = pd.read_excel(path, sheet_name=0)
-    dishes = []
-    for _, r in df.iterrows():
-        tags = r.get("tags")
-        tags = json.loads(tags) if isinstance(tags, str) else (tags or [])
-        ings = r.get("ingredients_json")
-        ings = json.loads(ings) if isinstance(ings, str) else (ings or [])
-        steps = r.get("steps_json")
-        steps = json.loads(steps) if isinstance(steps, str) else (steps or [])
-        dishes.append(Dish(
-            name=str(r["name"]).strip(),
-            meal_type=str(r["meal_type"]).strip().lower(),
-            tags=[str(t).strip().lower() for t in tags],
-            cook_minutes=int(r.get("cook_minutes",20)),
-            difficulty=int(r.get("difficulty",2)),
-            ingredients=[Ingredient(i.get("item","").lower(), float(i.get("qty",0) or 0), i.get("unit","")) for i in ings],
-            steps=[str(s) for s in steps],
-            flavor_text=(str(r.get("flavor_text")) if pd.notna(r.get("flavor_text")) else None),
-            rarity=str(r.get("rarity","common")).lower()
-        ))
-    return dishes
+DISH_COLUMNS = ["name","meal_type","tags","cook_minutes","difficulty","ingredients_json","steps_json","flavor_text","rarity"]
 
-def write_dishes(path: str, dishes: List[Dish]):
+def _decode_column(values) -> list:
+    """Decode a whole JSON column with one parser call; fall back cell-by-cell if any cell is bad"""
+    cells = [v if isinstance(v, str) and v.strip() else "[]" for v in values]
     try:
-        df = pd.read_excel(path, sheet_name=0)
-    except Exception:
-        import pandas as pd
-        df = pd.DataFrame(columns=["name","meal_type","tags","cook_minutes","difficulty","ingredients_json","steps_json","flavor_text","rarity"])
-    existing = set((str(n).lower().strip(), str(m).lower().strip()) for n, m in zip(df.get("name",[]), df.get("meal_type",[])))
-    rows = []
-    import json as _json
-    for d in dishes:
-        key = (d.name.lower().strip(), d.meal_type.lower().strip())
-        if key in existing: continue
-        rows.append({
-            "name": d.name,
-            "meal_type": d.meal_type,
-            "tags": _json.dumps(d.tags),
-            "cook_minutes": d.cook_minutes,
-            "difficulty": d.difficulty,
-            "ingredients_json": _json.dumps([vars(i) for i in d.ingredients]),
-            "steps_json": _json.dumps(d.steps),
-            "flavor_text": d.flavor_text or "",
-            "rarity": d.rarity or "common",
-        })
-    if rows:
-        df = pd.concat([df, pd.DataFrame(rows)], ignore_index=True)
-        df.to_excel(path, index=False)
+        out = _loads("[" + ",".join(cells) + "]")
+        if len(out) == len(cells): return out
+    except ValueError:
+        pass
+    decoded = []
+    for c in cells:
+        try: decoded.append(_loads(c))
+        except ValueError: decoded.append([])
+    return decoded
+
+def dishes_from_frame(df: pd.DataFrame) -> List[Dish]:
+    """Column-at-a-time decode of a dishes sheet (no iterrows, no per-row json.loads)"""
+    n = len(df)
+    def col(name, default):
+        return df[name].tolist() if name in df.columns else [default] * n
+    names = df["name"].astype(str).str.strip().tolist()
+    meals = df["meal_type"].astype(str).str.strip().str.lower().tolist()
+    cook = df["cook_minutes"].fillna(20).astype(int).tolist() if "cook_minutes" in df.columns else [20] * n
+    diff = df["difficulty"].fillna(2).astype(int).tolist() if "difficulty" in df.columns else [2] * n
+    flavor = [str(v) if pd.notna(v) else None for v in col("flavor_text", None)]
+    rarity = df["rarity"].fillna("common").astype(str).str.lower().tolist() if "rarity" in df.columns else ["common"] * n
+    tags = _decode_column(col("tags", None))
+    ings = _decode_column(col("ingredients_json", None))
+    steps = _decode_column(col("steps_json", None))
+    with paused_gc():
+        return [
+            Dish(
+                name=nm, meal_type=ml,
+                tags=[str(t).strip().lower() for t in tg],
+                cook_minutes=cm, difficulty=df_,
+                ingredients=[Ingredient(i.get("item","").lower(), float(i.get("qty",0) or 0), i.get("unit","")) for i in ig],
+                steps=[str(x) for x in st],
+                flavor_text=ft, rarity=rr
+            )
+            for nm, ml, tg, cm, df_, ig, st, ft, rr in zip(names, meals, tags, cook, diff, ings, steps, flavor, rarity)
+        ]
+
+def read_dishes_xlsx(path: str) -> List[Dish]:
+    # no decode cache: open_store imports a given sheet once per mtime, and callers mutate the Dishes
+    return dishes_from_frame(pd.read_excel(path, sheet_name=0))
+
+def write_dishes_xlsx(path: str, dishes: List[Dish]):
+    rows = [{
+        "name": d.name,
+        "meal_type": d.meal_type,
+        "tags": json.dumps(d.tags),
+        "cook_minutes": d.cook_minutes,
+        "difficulty": d.difficulty,
+        "ingredients_json": json.dumps([{"item": i.item, "qty": i.qty, "unit": i.unit} for i in d.ingredients]),
+        "steps_json": json.dumps(d.steps),
+        "flavor_text": d.flavor_text or "",
+        "rarity": d.rarity or "common",
+    } for d in dishes]
+    pd.DataFrame(rows, columns=DISH_COLUMNS).to_excel(path, index=False)
     return len(rows)
 
+def open_store(path) -> DishStore:
+    """SQLite store next to dishes.xlsx, with spreadsheet edits folded in since the last import"""
+    store = DishStore(path)
+    if store.count() == 0:
+        snap = catalog_path(path)
+        if snap.exists(): store.add_dishes(read_catalog(snap))
+    xlsx = Path(path).with_name("dishes.xlsx") if Path(path).suffix != ".xlsx" else Path(path)
+    if xlsx.exists() and xlsx.stat().st_mtime_ns > int(store.get_meta("xlsx_mtime_ns", "0")):
+        import_dishes_xlsx(store, xlsx)
+    # overlay ingests still sitting in the journal (a crashed compaction may have committed some)
+    pending = read_journal(path)
+    if pending:
+        seen = store.existing_keys(dish_key(d) for d in pending)
+        for d in pending:
+            k = dish_key(d)
+            if k in seen: continue
+            seen.add(k); store.pending.append(d)
+    return store
+
+def import_dishes_xlsx(store: DishStore, xlsx) -> int:
+    """Upsert every spreadsheet row; spreadsheet rows win on (name, meal_type)"""
+    n = store.add_dishes(read_dishes_xlsx(str(xlsx)), replace=True)
+    with store.con:
+        store.set_meta("xlsx_mtime_ns", Path(xlsx).stat().st_mtime_ns)
+    return n
+
+def export_dishes_xlsx(path: str, out: str) -> int:
+    """Write the catalog out as a spreadsheet without it being re-imported on the next read"""
+    with open_store(path) as store:
+        n = write_dishes_xlsx(out, store.all_dishes())
+        if Path(out).resolve() == (store.path.parent / "dishes.xlsx").resolve():
+            with store.con:
+                store.set_meta("xlsx_mtime_ns", Path(out).stat().st_mtime_ns)
+    return n
+
+def _snapshot_table(store: DishStore, path) -> pa.Table:
+    # SQLite is the store of record; the Parquet snapshot serves full loads until the store version moves
+    snap, version = catalog_path(path), store.version
+    if catalog_version(snap) == version:
+        return read_table(snap)
+    table = dishes_to_table(store.all_dishes(include_pending=False))
+    write_table(snap, table, version)
+    return table
+
+def read_dishes(path: str) -> List[Dish]:
+    # uncompacted journal entries are appended on top of the snapshot
+    with open_store(path) as store:
+        return table_to_dishes(_snapshot_table(store, path)) + store.pending
+
+def catalog_key(store: DishStore) -> str:
+    """Identifies the catalog contents: store version plus the journal entries overlaid on it"""
+    return f"{store.version}+{len(store.pending)}"
+
+def catalog_table(store: DishStore, path) -> pa.Table:
+    """Whole catalog as one Arrow table: snapshot rows, then uncompacted journal entries"""
+    table = _snapshot_table(store, path)
+    if store.pending:
+        table = pa.concat_tables([table, dishes_to_table(store.pending)])
+    return table
+
+def read_compact_catalog(path: str) -> CompactCatalog:
+    """Whole catalog (snapshot + journal) in the compact struct-of-arrays form"""
+    with open_store(path) as store:
+        return CompactCatalog.from_table(catalog_table(store, path))
+
+def _batched(items: Iterable, n: int) -> Iterator[list]:
+    it = iter(items)
+    while batch := list(islice(it, n)):
+        yield batch
+
+def write_dishes(path: str, dishes: List[Dish]):
+    # O(batch): indexed key lookups, then one append to the ingest journal; the store and the
+    # Parquet snapshot are left alone until compaction
+    return write_dishes_stream(path, dishes, batch_size=max(len(dishes), 1))
+
+def write_dishes_stream(path: str, dishes: Iterable[Dish], batch_size: int = 500) -> int:
+    """write_dishes for a dish iterator: each batch is deduped and journaled as soon as it fills,
+    so memory is bounded by the batch rather than the whole source"""
+    n = 0
+    with open_store(path) as store:
+        written = set()
+        for batch in _batched(dishes, batch_size):
+            seen = store.existing_keys(dish_key(d) for d in batch) | written
+            rows = []
+            for d in batch:
+                k = dish_key(d)
+                if k in seen: continue
+                seen.add(k); written.add(k); rows.append(d)
+            n += journal_append(path, rows)
+        backlog = len(store.pending) + n
+    if backlog >= COMPACT_AT:
+        compact_in_background(path)
+    return n
+
 def read_slots(path: str) -> dict[str, list[str]]:
     df = pd.read_excel(path, sheet_name=0)
     out = {}
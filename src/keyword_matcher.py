@@ -0,0 +1,96 @@
+"""
+Multi-Keyword Matcher for Nigela
+One Aho-Corasick automaton over every registered keyword table (meal slots, cuisines, YouTube
+channel specialties). A single pass over a string reports every keyword it contains, with the same
+answers as checking `keyword in text` for each keyword. Uses pyahocorasick when installed.
+"""
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+Label = Tuple[str, str]   # (table, key)
+
+class KeywordMatcher:
+    def __init__(self, tables: Dict[str, Dict[str, Iterable[str]]]):
+        self.labels: Dict[str, List[Label]] = {}
+        for table, entries in tables.items():
+            for key, words in entries.items():
+                for w in words:
+                    self.labels.setdefault(w, []).append((table, key))
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for w in self.labels:
+                if w: self._automaton.add_word(w, w)
+            self._automaton.make_automaton()
+        else:
+            self._build([w for w in self.labels if w])
+
+    def _build(self, words: List[str]):
+        # goto trie, failure links and outputs merged along the failure chain
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Set[str]] = [set()]
+        for w in words:
+            s = 0
+            for ch in w:
+                if ch not in goto[s]:
+                    goto.append({}); out.append(set())
+                    goto[s][ch] = len(goto) - 1
+                s = goto[s][ch]
+            out[s].add(w)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for s in queue:
+            for ch, t in goto[s].items():
+                f = fail[s]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[t] = goto[f].get(ch, 0) if goto[f].get(ch, 0) != t else 0
+                out[t] |= out[fail[t]]
+                queue.append(t)
+        self._goto, self._fail = goto, fail
+        self._out = [frozenset(o) for o in out]
+
+    def keywords(self, text: str) -> Set[str]:
+        """Every registered keyword that occurs in text"""
+        if not text: return set()
+        if ahocorasick is not None:
+            return {w for _, w in self._automaton.iter(text)}
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        s = 0
+        for ch in text:
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            if out[s]: found |= out[s]
+        return found
+
+    def match(self, text: str) -> Dict[str, Set[str]]:
+        """table -> keys with at least one keyword in text"""
+        hits: Dict[str, Set[str]] = {}
+        for w in self.keywords(text):
+            for table, key in self.labels[w]:
+                hits.setdefault(table, set()).add(key)
+        return hits
+
+_TABLES: Dict[str, Dict[str, Iterable[str]]] = {}
+_MATCHER = None
+
+def register(table: str, entries: Dict[str, Iterable[str]]):
+    """Add a keyword table to the shared matcher (rebuilt lazily on the next match)"""
+    global _MATCHER
+    _TABLES[table] = {k: list(v) for k, v in entries.items()}
+    _MATCHER = None
+
+def matcher() -> KeywordMatcher:
+    global _MATCHER
+    if _MATCHER is None:
+        _MATCHER = KeywordMatcher(_TABLES)
+    return _MATCHER
+
+def match(text: str) -> Dict[str, Set[str]]:
+    return matcher().match(text)
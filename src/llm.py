@@ -1,8 +1,10 @@
 import os, json, math, hashlib
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from openai import OpenAI
 from .config import OPENAI_API_KEY, OPENAI_MODEL_MAIN, OPENAI_MODEL_LITE, OPENAI_EMBED_MODEL
 from .models import Dish, Ingredient
+from .ingredient_parser import parse_block
 
 _client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
@@ -48,14 +50,33 @@ def parse_recipe_block(raw_text: str, meal_hint: Optional[str]=None, cuisine_hin
     )
     return json.loads(resp.choices[0].message.content)
 
-def parse_recipe_block_batch(blocks: List[str], meal_hint: Optional[str], cuisines: List[Optional[str]]) -> List[Dict[str,Any]]:
-    # small helper that runs one-by-one to keep memory low; swap to Batch API for huge sets
+@dataclass
+class BlockStats:
+    local: int = 0    # parsed by the rule-based parser, no model call
+    llm: int = 0
+    failed: int = 0
+
+    @property
+    def avoided(self) -> float:
+        """Share of blocks that never reached the model"""
+        total = self.local + self.llm + self.failed
+        return self.local / total if total else 0.0
+
+def parse_recipe_block_batch(blocks: List[str], meal_hint: Optional[str], cuisines: List[Optional[str]],
+                             stats: Optional[BlockStats] = None) -> List[Dict[str,Any]]:
+    # clean ingredient-list blocks are parsed locally; only low-confidence (or non-Jain) ones go to the model.
+    # runs one-by-one to keep memory low; swap to Batch API for huge sets
+    stats = stats or BlockStats()
     out=[]
     for i, b in enumerate(blocks):
+        cuisine = cuisines[i] if i < len(cuisines) else None
+        local = parse_block(b, meal_hint, cuisine)
+        if local:
+            out.append(local); stats.local += 1; continue
         try:
-            out.append(parse_recipe_block(b, meal_hint, cuisines[i] if i < len(cuisines) else None))
+            out.append(parse_recipe_block(b, meal_hint, cuisine)); stats.llm += 1
         except Exception:
-            continue
+            stats.failed += 1
     return out
 
 # ---------- B) Title classifier ----------
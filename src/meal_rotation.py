@@ -3,16 +3,41 @@ Advanced Meal Rotation System for Nigela
 Ensures variety, follows structure preferences, prevents repetition
 """
 
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
+import os
 import random
 from pathlib import Path
+import numpy as np
+from .rotation_scheduler import RotationScheduler
+from .tag_index import load_indexed_catalog
+from .catalog import catalog_path
+from .dish_store import store_path
+from .ingest_journal import journal_path
+from .nigella_persona import NigellaPersona
+
+# catalog tags whose dishes make up each rotation category
+CATEGORY_TAGS = {
+    'dal': ['lunch:dal'],
+    'roti_flour': ['lunch:roti', 'dinner:bread'],
+    'khichdi': ['dinner:khichdi'],
+    'vegetables': ['lunch:vegetable'],
+    'rice': ['lunch:rice'],
+    'surprise_items': ['dinner:vegetable_west'],
+}
 
 class MealRotationManager:
-    def __init__(self, data_dir="data"):
+    def __init__(self, data_dir="data", use_catalog: bool = True):
         self.data_dir = Path(data_dir)
-        self.history_file = self.data_dir / "meal_history.json"
+        self.history_file = self.data_dir / "meal_history.json"   # snapshot: recent window + last-used index
+        self.log_file = self.data_dir / "meal_history.jsonl"      # every planned day, append-only
+        self._unsaved: List[Dict] = []
+        self._schedulers: Dict[str, RotationScheduler] = {}
+        self.min_gaps: Dict[str, int] = {}   # category -> minimum days between repeats of an item
+        self.gap_violations: Dict[str, int] = {}
+        self._batch_depth = 0
         self.load_history()
         
         # Meal structure templates
@@ -72,51 +97,171 @@ class MealRotationManager:
             ]
         }
         
+        # Rotation categories resolved against the dish catalog (hardcoded lists above are the fallback)
+        self.catalog = None
+        self.category_ids: Dict[str, np.ndarray] = {}
+        self.dish_ids: Dict[Tuple[str, str], List[int]] = {}   # (category, name) -> dish ids
+        xlsx = self.data_dir / "dishes.xlsx"
+        # any of the files open_store reads: ingest commands leave dishes.db and the journal, not an xlsx
+        if use_catalog and any(p.exists() for p in (xlsx, store_path(xlsx), catalog_path(xlsx), journal_path(xlsx))):
+            self.bind_catalog(*load_indexed_catalog(xlsx))
+        
     def load_history(self):
-        """Load meal history from JSON file"""
+        """Load the history snapshot, then replay days logged after it was written"""
+        fresh = {
+            'last_14_days': [],
+            'last_used_dates': {},
+            'weekly_structure_count': {}
+        }
         try:
             if self.history_file.exists():
                 with open(self.history_file, 'r') as f:
                     self.history = json.load(f)
             else:
-                self.history = {
-                    'last_14_days': [],
-                    'last_used_dates': {},
-                    'weekly_structure_count': {}
-                }
+                self.history = fresh
         except Exception:
-            self.history = {
-                'last_14_days': [],
-                'last_used_dates': {},
-                'weekly_structure_count': {}
-            }
+            self.history = fresh
+        offset = self.history.pop('log_offset', None)
+        if offset is None and self.history is not fresh and not self.log_file.exists():
+            # meal_history.json from before the log: carry its days into the log on the next save
+            self._unsaved = list(self.history.get('last_14_days', []))
+        elif offset is None:
+            # snapshot missing or unreadable: the log is the record, rebuild everything from it
+            self.history = {'last_14_days': [], 'last_used_dates': {}, 'weekly_structure_count': self.history.get('weekly_structure_count', {})}
+            offset = 0
+        if not self.history.get('last_used_dates'):
+            self.history['last_used_dates'] = {}
+            for day_data in self.history.get('last_14_days', []):
+                self._index_day(day_data)
+        for day_data in self._read_log(offset or 0):
+            self.history['last_14_days'].append(day_data)
+            self._index_day(day_data)
+        self._trim_window()
+    
+    def _read_log(self, offset: int = 0) -> Iterator[Dict]:
+        if not self.log_file.exists(): return
+        with open(self.log_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue   # torn line from a crash mid-append
+    
+    def iter_history(self) -> Iterator[Dict]:
+        """Every day ever planned, oldest first (for analytics; planning only needs the window)"""
+        yield from self._read_log(0)
+        yield from self._unsaved
     
     def save_history(self):
-        """Save meal history to JSON file"""
+        """Append unsaved days to the log (one fsync'd write), then replace the snapshot.
+        Inside batch() this waits until the outermost batch ends."""
+        if self._batch_depth: return
         self.data_dir.mkdir(exist_ok=True)
-        with open(self.history_file, 'w') as f:
-            json.dump(self.history, f, indent=2, default=str)
+        with open(self.log_file, 'ab') as f:
+            if self._unsaved:
+                if f.tell() and not self._ends_with_newline():
+                    f.write(b"\n")   # don't glue onto a torn last line
+                f.write("".join(json.dumps(d, default=str) + "\n" for d in self._unsaved).encode())
+                f.flush(); os.fsync(f.fileno())
+            offset = f.tell()
+        self._unsaved = []
+        tmp = self.history_file.with_name(self.history_file.name + ".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(dict(self.history, log_offset=offset), f, default=str)
+        os.replace(tmp, self.history_file)
+    
+    def _ends_with_newline(self) -> bool:
+        with open(self.log_file, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    @contextmanager
+    def batch(self):
+        """Group several generate_daily_plan calls into a single history write"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+        self.save_history()
+    
+    def _trim_window(self, days: int = 14):
+        # relative to the newest planned day too, so planning far ahead keeps the window bounded
+        newest = max((datetime.fromisoformat(d['date']) for d in self.history['last_14_days'][-1:]), default=datetime.now())
+        cutoff_date = max(datetime.now(), newest) - timedelta(days=days)
+        self.history['last_14_days'] = [
+            day for day in self.history['last_14_days']
+            if datetime.fromisoformat(day['date']) > cutoff_date
+        ]
+    
+    def _index_day(self, day_data: Dict):
+        """Fold a day's categorized items into the category -> item -> last-used date index"""
+        index = self.history['last_used_dates']
+        for meal_items in day_data.get('meals', {}).values():
+            for item in meal_items.values():
+                if not isinstance(item, dict) or not item.get('category'): continue
+                used = index.setdefault(item['category'], {})
+                name = item.get('name')
+                if name not in used or datetime.fromisoformat(day_data['date']) > datetime.fromisoformat(used[name]):
+                    used[name] = day_data['date']
+                if item['category'] in self._schedulers:
+                    self._schedulers[item['category']].touch(name, day_data['date'])
     
     def get_available_items(self, category: str, exclude_days: int = 14) -> List[str]:
-        """Get items not used in the last N days"""
+        """Get items not used in the last N days (one index lookup per item in the category)"""
         cutoff_date = datetime.now() - timedelta(days=exclude_days)
         
-        recently_used = set()
-        for day_data in self.history['last_14_days']:
-            if datetime.fromisoformat(day_data['date']) > cutoff_date:
-                for meal_items in day_data.get('meals', {}).values():
-                    for item in meal_items:
-                        if item.get('category') == category:
-                            recently_used.add(item.get('name'))
-        
-        available = [item for item in self.rotation_items[category] if item not in recently_used]
+        last_used = self.history['last_used_dates'].get(category, {})
+        available = [item for item in self.rotation_items[category]
+                     if item not in last_used or datetime.fromisoformat(last_used[item]) <= cutoff_date]
         
-        # If all items used recently, reset with least recently used
+        # If all items used recently, fall back to the least recently used
         if not available:
-            available = self.rotation_items[category][:3]  # Use first 3 as fallback
+            available = self.scheduler(category).peek(3)
             
         return available
     
+    def bind_catalog(self, catalog, index):
+        """Rotate over catalog dishes: category -> dish ids from the tag index, computed once here.
+        Categories with no tagged dishes keep their hardcoded items."""
+        self.catalog = catalog
+        names = catalog.names.to_pylist()
+        for category, tags in CATEGORY_TAGS.items():
+            ids = np.unique(np.concatenate([index.ids_for(t) for t in tags]))
+            if not len(ids): continue
+            self.category_ids[category] = ids
+            for i in ids.tolist():
+                # a name can be several dishes ("Bhakri" for lunch:roti and dinner:bread); keep them all
+                self.dish_ids.setdefault((category, names[i]), []).append(i)
+            self.rotation_items[category] = list(dict.fromkeys(names[i] for i in ids.tolist()))
+            self._schedulers.pop(category, None)
+    
+    def _rotation_item(self, category: str, day: datetime, meal: Optional[str] = None) -> Dict:
+        item = {'name': self.select_item(category, day), 'category': category}
+        if category in self.category_ids:
+            # the dish id from this category, for this meal when the name is tagged for several
+            ids = self.dish_ids[(category, item['name'])]
+            meals = self.catalog.meal_vocab
+            item['dish_id'] = next((i for i in ids if meals[self.catalog.meal[i]] == meal), ids[0])
+        return item
+    
+    def scheduler(self, category: str) -> RotationScheduler:
+        """LRU rotation over a category, seeded from the last-used index"""
+        if category not in self._schedulers:
+            self._schedulers[category] = RotationScheduler(
+                self.rotation_items[category], self.history['last_used_dates'].get(category, {}))
+        return self._schedulers[category]
+    
+    def select_item(self, category: str, day: datetime) -> str:
+        """Least recently used item of a category (O(log n)); ties are broken at random.
+        Picks that land inside the category's minimum repeat gap are counted in gap_violations."""
+        sched, gap = self.scheduler(category), self.min_gaps.get(category, 0)
+        item = sched.pick(day, gap)
+        if gap and sched.last_gap is not None and sched.last_gap < gap:
+            self.gap_violations[category] = self.gap_violations.get(category, 0) + 1
+        return item
+    
     def select_meal_structure(self, day_of_week: int) -> str:
         """Select meal structure based on day and variety"""
         structures = list(self.meal_structures.keys())
@@ -131,13 +276,13 @@ class MealRotationManager:
         else:  # Sunday - special day
             return 'festival_special'
     
-    def generate_daily_plan(self, target_date: datetime = None) -> Dict:
-        """Generate daily meal plan with variety and structure"""
+    def generate_daily_plan(self, target_date: datetime = None, festival: Optional[str] = None) -> Dict:
+        """Generate daily meal plan with variety and structure (festival days get the festival menu)"""
         if not target_date:
             target_date = datetime.now() + timedelta(days=1)
         
         day_of_week = target_date.weekday()
-        structure_type = self.select_meal_structure(day_of_week)
+        structure_type = 'festival_special' if festival else self.select_meal_structure(day_of_week)
         structure = self.meal_structures[structure_type]
         
         daily_plan = {
@@ -145,6 +290,8 @@ class MealRotationManager:
             'structure_type': structure_type,
             'meals': {}
         }
+        if festival:
+            daily_plan['festival'] = festival
         
         # Generate breakfast (always similar structure)
         daily_plan['meals']['breakfast'] = {
@@ -168,51 +315,27 @@ class MealRotationManager:
             daily_plan['meals']['lunch'] = {}
             for slot in structure['lunch']:
                 if slot == 'dal':
-                    available_dals = self.get_available_items('dal')
-                    daily_plan['meals']['lunch']['dal'] = {
-                        'name': random.choice(available_dals),
-                        'category': 'dal'
-                    }
+                    daily_plan['meals']['lunch']['dal'] = self._rotation_item('dal', target_date, 'lunch')
                 elif slot == 'roti':
-                    available_rotis = self.get_available_items('roti_flour')
-                    daily_plan['meals']['lunch']['roti'] = {
-                        'name': random.choice(available_rotis),
-                        'category': 'roti_flour'
-                    }
+                    daily_plan['meals']['lunch']['roti'] = self._rotation_item('roti_flour', target_date, 'lunch')
                 elif slot == 'rice':
-                    available_rice = self.get_available_items('rice')
-                    daily_plan['meals']['lunch']['rice'] = {
-                        'name': random.choice(available_rice),
-                        'category': 'rice'
-                    }
+                    daily_plan['meals']['lunch']['rice'] = self._rotation_item('rice', target_date, 'lunch')
                 elif slot == 'vegetable':
-                    available_veg = self.get_available_items('vegetables')
-                    daily_plan['meals']['lunch']['vegetable'] = {
-                        'name': random.choice(available_veg),
-                        'category': 'vegetables'
-                    }
+                    daily_plan['meals']['lunch']['vegetable'] = self._rotation_item('vegetables', target_date, 'lunch')
                 elif slot == 'salad':
                     daily_plan['meals']['lunch']['salad'] = {
                         'name': 'fresh_seasonal_salad',
                         'category': 'salad'
                     }
                 elif slot in ['healthy_burger', 'protein_bowl']:
-                    available_surprise = self.get_available_items('surprise_items')
-                    daily_plan['meals']['lunch'][slot] = {
-                        'name': random.choice(available_surprise),
-                        'category': 'surprise_items'
-                    }
+                    daily_plan['meals']['lunch'][slot] = self._rotation_item('surprise_items', target_date, 'lunch')
         
         # Generate dinner based on structure
         if 'dinner' in structure:
             daily_plan['meals']['dinner'] = {}
             for slot in structure['dinner']:
                 if slot == 'khichdi':
-                    available_khichdi = self.get_available_items('khichdi')
-                    daily_plan['meals']['dinner']['khichdi'] = {
-                        'name': random.choice(available_khichdi),
-                        'category': 'khichdi'
-                    }
+                    daily_plan['meals']['dinner']['khichdi'] = self._rotation_item('khichdi', target_date, 'dinner')
                 elif slot in ['soup_light', 'soup']:
                     daily_plan['meals']['dinner']['soup'] = {
                         'name': self._select_soup(),
@@ -221,13 +344,11 @@ class MealRotationManager:
         
         # Update history
         self.history['last_14_days'].append(daily_plan)
+        self._index_day(daily_plan)
+        self._unsaved.append(daily_plan)
         
-        # Keep only last 14 days
-        cutoff_date = datetime.now() - timedelta(days=14)
-        self.history['last_14_days'] = [
-            day for day in self.history['last_14_days']
-            if datetime.fromisoformat(day['date']) > cutoff_date
-        ]
+        # Keep only last 14 days in memory; the log keeps everything
+        self._trim_window()
         
         self.save_history()
         return daily_plan
@@ -322,20 +443,38 @@ def get_curated_youtube_link(recipe_name: str, cuisine_hint: str = None) -> str:
     search_query = f"{channel['search_prefix']} {recipe_name}"
     return f"https://www.youtube.com/results?search_query={urllib.parse.quote_plus(search_query)}"
 
-def generate_weekly_meal_plan(start_date: datetime = None) -> List[Dict]:
-    """Generate complete weekly meal plan with variety"""
+# Default minimum days between repeats of one item, per rotation category
+MIN_REPEAT_GAPS = {
+    'dal': 7, 'roti_flour': 5, 'khichdi': 7, 'vegetables': 7, 'rice': 5, 'surprise_items': 14,
+}
+
+def generate_horizon_plan(start_date: datetime = None, days: int = 365, min_gaps: Dict[str, int] = None,
+                          festival_days: Dict = None, manager: "MealRotationManager" = None) -> List[Dict]:
+    """Plan `days` consecutive days in one pass: weekday structures, festival menus on the given
+    dates ({date: festival name}), and per-category minimum repeat gaps. Everything runs in
+    memory and the history is written once at the end. Each day also carries its month's
+    festivals from the Hindu calendar."""
     if not start_date:
         start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     
-    manager = MealRotationManager()
-    weekly_plan = []
+    manager = manager or MealRotationManager()
+    manager.min_gaps = dict(MIN_REPEAT_GAPS if min_gaps is None else min_gaps)
+    calendar = NigellaPersona().hindu_calendar
+    festival_days = {(d.date() if isinstance(d, datetime) else d): name for d, name in (festival_days or {}).items()}
+    plans = []
     
-    for day in range(7):
-        target_date = start_date + timedelta(days=day)
-        daily_plan = manager.generate_daily_plan(target_date)
-        weekly_plan.append(daily_plan)
+    with manager.batch():
+        for day in range(days):
+            target_date = start_date + timedelta(days=day)
+            daily_plan = manager.generate_daily_plan(target_date, festival=festival_days.get(target_date.date()))
+            daily_plan['month_festivals'] = calendar.get(target_date.month, {}).get('festivals', [])
+            plans.append(daily_plan)
     
-    return weekly_plan
+    return plans
+
+def generate_weekly_meal_plan(start_date: datetime = None) -> List[Dict]:
+    """Generate complete weekly meal plan with variety"""
+    return generate_horizon_plan(start_date, days=7, min_gaps={})
 
 if __name__ == "__main__":
     # Test the rotation system
@@ -0,0 +1,150 @@
+"""
+Bulk Menu Import for Nigela
+Reads the curated idea sources in one pass (menus/Weekly Menu.xlsx and the 365_*_ideas.md books),
+merges them into one dish list keyed like the store (name, meal type), drops what the catalog
+already holds (store index, spreadsheet edits and journaled ingests), and inserts the rest in a single
+transaction.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from .models import Dish, Ingredient
+from .normalize import guess_tags
+from .dish_store import dish_key
+from .io_xls import open_store
+from .ebooks_ingest import infer_cuisine
+from .ingredient_parser import parse_amount, parse_ingredient
+
+WEEKLY_MENU = "menus/Weekly Menu.xlsx"
+IDEA_BOOKS = "365_*_ideas.md"
+MEALS = {"breakfast": "breakfast", "lunch": "lunch", "dinner": "dinner", "snack": "evening_snack", "snacks": "evening_snack"}
+DEFAULT_FLAVOR = "Nigela whispers: keep it gentle."
+
+INDEX_LINE = re.compile(r"^\s*\d+\.\s+\[(?P<name>[^\]]+)\]\([^)]*\)(?:\s*-\s*(?P<minutes>\d+)\s*min)?\s*(?P<stars>⭐*)")
+SECTION = re.compile(r"^###\s+(?:\d+\.\s+)?(?P<name>[^\n]+?)\s*$")
+MINUTES = re.compile(r"(?:Cook|Prep) Time:\*\*\s*(\d+)", re.I)
+DIFFICULTY = re.compile(r"Difficulty:\*\*.*?\((\d)/5\)", re.I)
+WISDOM = re.compile(r"^>\s*\*?Nigela's (?:Wisdom|Note):\s*\"?(.+?)\"?\*?\s*$")
+URL = re.compile(r"https?://\S+")
+CELL_SPLIT = re.compile(r"[,;+\n/]")
+
+@dataclass
+class ImportStats:
+    sources: Dict[str, int] = field(default_factory=dict)
+    unique: int = 0
+    existing: int = 0
+    added: int = 0
+
+def _dish(name: str, meal: str, minutes: Optional[int] = None, difficulty: Optional[int] = None,
+          ingredients: Optional[List[Ingredient]] = None, steps: Optional[List[str]] = None,
+          flavor: Optional[str] = None) -> Dish:
+    return Dish(
+        name=name, meal_type=meal, tags=guess_tags(name, meal, infer_cuisine(name)),
+        cook_minutes=minutes or 20, difficulty=difficulty or 2,
+        ingredients=ingredients or [Ingredient("salt", 1, "tsp")],
+        steps=steps or ["Prep ingredients", "Cook to taste"],
+        flavor_text=flavor or DEFAULT_FLAVOR, rarity="common",
+    )
+
+def _md_ingredient(line: str) -> Ingredient:
+    """'Rice: 1/2 cup' -> rice, 0.5, cup ('Salt: to taste' keeps qty 0)"""
+    item, sep, amount = line.partition(":")
+    if not sep: return parse_ingredient(line)
+    parsed = parse_amount(amount.split(",")[0]).ingredient   # qty and unit only; the item is left of the colon
+    return Ingredient(item.strip().lower(), parsed.qty, parsed.unit)
+
+def _md_sections(lines: List[str]) -> Iterator[Tuple[str, List[str]]]:
+    name, body = None, []
+    for line in lines:
+        m = SECTION.match(line)
+        if m or line.startswith("## "):
+            if name: yield name, body
+            name, body = (m.group("name"), []) if m else (None, [])
+        elif name:
+            body.append(line)
+    if name: yield name, body
+
+def idea_book_dishes(path: Path, meal: str) -> List[Dish]:
+    """Index entries ('12. [Upma](#upma) - 15min ⭐⭐') plus the detailed recipe sections, which
+    fill in time, difficulty, ingredients and method for the dishes they describe"""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    found: Dict[str, Dish] = {}
+    for line in lines:
+        m = INDEX_LINE.match(line)
+        if m:
+            name = m.group("name").strip()
+            found.setdefault(name.lower(), _dish(name, meal, int(m.group("minutes") or 0) or None, len(m.group("stars")) or None))
+    for name, body in _md_sections(lines):
+        text = "\n".join(body)
+        minutes, difficulty = MINUTES.search(text), DIFFICULTY.search(text)
+        if not (minutes or difficulty): continue   # a category heading, not a recipe
+        ingredients, steps, flavor, block = [], [], None, None
+        for line in body:
+            s = line.strip()
+            if s.startswith("**"):
+                block = "ing" if "Ingredients" in s else "steps" if "Method" in s else None
+            elif block == "ing" and s.startswith("- "):
+                ingredients.append(_md_ingredient(s[2:]))
+            elif block == "steps" and re.match(r"\d+\.\s", s):
+                steps.append(s.split(".", 1)[1].strip())
+            elif WISDOM.match(s):
+                flavor = WISDOM.match(s).group(1).strip("\"* ")
+        found[name.lower()] = _dish(name, meal, int(minutes.group(1)) if minutes else None,
+                                    int(difficulty.group(1)) if difficulty else None, ingredients, steps, flavor)
+    return list(found.values())
+
+def clean_cell_item(text: str) -> str:
+    """'Soya Paneer Chilli- Rushabh and Palak' -> 'Soya Paneer Chilli'; notes after a dash, URLs and
+    stray brackets are dropped"""
+    s = re.split(r"\s*-\s+|-\s*$", URL.sub("", text))[0]
+    s = re.sub(r"\s+", " ", s.replace("(", " ").replace(")", " ")).strip(" .-")
+    return s[:1].upper() + s[1:]
+
+def weekly_menu_dishes(path: Path) -> List[Dish]:
+    """Rows labelled Breakfast/Lunch/Snack/Dinner; each cell lists that day's dishes"""
+    df = pd.read_excel(path, sheet_name=None, header=None)
+    found: Dict[Tuple[str, str], Dish] = {}
+    for sheet in df.values():
+        for row in sheet.itertuples(index=False):
+            meal = MEALS.get(str(row[0]).strip().lower())
+            if not meal: continue
+            for cell in row[1:]:
+                if not isinstance(cell, str): continue
+                for part in CELL_SPLIT.split(URL.sub("", cell)):
+                    name = clean_cell_item(part)
+                    if len(name) >= 3 and re.search(r"[A-Za-z]{3}", name):
+                        found.setdefault((name.lower(), meal), _dish(name, meal))
+    return list(found.values())
+
+def collect_menu_dishes(root=".") -> Tuple[List[Dish], Dict[str, int]]:
+    """Dishes from every source, deduped by store key; earlier sources win, so a detailed
+    recipe from an idea book beats a bare spreadsheet cell for the same dish"""
+    root = Path(root)
+    merged: Dict[Tuple[str, str], Dish] = {}
+    counts: Dict[str, int] = {}
+    sources = [(p, MEALS.get(p.stem.split("_")[1])) for p in sorted(root.glob(IDEA_BOOKS))]
+    for p, meal in sources:
+        if not meal: continue
+        dishes = idea_book_dishes(p, meal)
+        counts[p.name] = len(dishes)
+        for d in dishes: merged.setdefault(dish_key(d), d)
+    xlsx = root / WEEKLY_MENU
+    if xlsx.exists():
+        dishes = weekly_menu_dishes(xlsx)
+        counts[xlsx.name] = len(dishes)
+        for d in dishes: merged.setdefault(dish_key(d), d)
+    return list(merged.values()), counts
+
+def import_menus(root=".", data_dir="data") -> ImportStats:
+    dishes, counts = collect_menu_dishes(root)
+    stats = ImportStats(sources=counts, unique=len(dishes))
+    # open_store folds in a newer dishes.xlsx and the uncompacted journal, so dedup sees what readers see
+    with open_store(f"{data_dir}/dishes.xlsx") as store:
+        existing = store.existing_keys(dish_key(d) for d in dishes)
+        fresh = [d for d in dishes if dish_key(d) not in existing]
+        stats.existing = len(dishes) - len(fresh)
+        stats.added = store.add_dishes(fresh)
+    return stats
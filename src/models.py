@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Ingredient:
     item: str
     qty: float
@@ -1,6 +1,7 @@
 import re
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 from .models import Dish, Ingredient
+from . import keyword_matcher
 
 DISH_LINE = re.compile(r"^\s*(?:-|\u2022|\*)?\s*([A-Za-z0-9 ()/&,+.'-]{3,80})\s*$", re.I)
 
@@ -22,29 +23,34 @@ SLOT_KEYWORDS = {
   "dinner:protein_farsan": ["tikki","muthiya","paneer","tofu"],
   "dinner:digestif": ["ajwain","fennel","saunf","haritaki"],
 }
+keyword_matcher.register("slot", SLOT_KEYWORDS)
 
 def guess_tags(name: str, meal_hint: Optional[str] = None, cuisine_hint: Optional[str] = None) -> List[str]:
     low = (name or "").lower()
     tags = ["jain","vegetarian"]
     if cuisine_hint:
         tags.append(f"cuisine:{cuisine_hint.lower()}")
-    for slot, kws in SLOT_KEYWORDS.items():
-        if any(k in low for k in kws):
-            tags.append(slot)
+    hit = keyword_matcher.match(low).get("slot", ())
+    tags.extend(slot for slot in SLOT_KEYWORDS if slot in hit)
     if meal_hint and all(not t.startswith(meal_hint) for t in tags):
         tags.append(f"{meal_hint}:misc")
     return list(dict.fromkeys(tags))
 
-def text_to_dishes(raw_text: str, meal_hint: Optional[str] = None, cuisine_hint: Optional[str] = None) -> List[Dish]:
-    lines = [l.strip() for l in (raw_text or "").splitlines() if l.strip()]
-    out = []
+def iter_lines(texts: Iterable[str]) -> Iterator[str]:
+    """Stripped, non-empty lines from a stream of text chunks (pages, messages, ...)"""
+    for text in texts:
+        for l in (text or "").splitlines():
+            l = l.strip()
+            if l: yield l
+
+def iter_dishes(lines: Iterable[str], meal_hint: Optional[str] = None, cuisine_hint: Optional[str] = None) -> Iterator[Dish]:
     for l in lines:
         m = DISH_LINE.match(l)
         if not m: continue
         name = m.group(1)
         tags = guess_tags(name, meal_hint, cuisine_hint)
         meal_type = (meal_hint or (tags[0].split(":")[0] if ":" in tags[0] else "dinner")).split(":")[0]
-        out.append(Dish(
+        yield Dish(
             name=name,
             meal_type=meal_type,
             tags=tags, cook_minutes=20, difficulty=2,
@@ -52,5 +58,7 @@ def text_to_dishes(raw_text: str, meal_hint: Optional[str] = None, cuisine_hint:
             steps=["Prep ingredients","Cook to taste"],
             flavor_text="Nigela whispers: keep it gentle.",
             rarity="common"
-        ))
-    return out
+        )
+
+def text_to_dishes(raw_text: str, meal_hint: Optional[str] = None, cuisine_hint: Optional[str] = None) -> List[Dish]:
+    return list(iter_dishes(iter_lines([raw_text]), meal_hint, cuisine_hint))
@@ -1,14 +1,96 @@
+import os, time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
 import pytesseract
-from PIL import Image
-from .normalize import text_to_dishes
+from PIL import Image, ImageOps
+from .normalize import iter_dishes, iter_lines, text_to_dishes
+from .text_cache import cached_text
 
-def image_to_text(path: str) -> str:
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp", ".webp"}
+MAX_SIDE = 2200       # px; phone photos are ~4000px, tesseract gains nothing past ~300 dpi on a page
+MAX_SKEW = 5.0        # degrees searched by deskew, in SKEW_STEP increments
+SKEW_STEP = 0.5
+
+@lru_cache(maxsize=2)
+def ocr_extractor(preprocess: bool = True) -> str:
+    """Cache key component: OCR output changes with the tesseract build and the preprocessing"""
+    return f"tesseract {pytesseract.get_tesseract_version()} r2{' prep' if preprocess else ''}"
+
+def deskew_angle(im: Image.Image) -> float:
+    """Rotation that makes text lines horizontal: the angle whose row-ink profile is sharpest,
+    searched on a small copy of the (grayscale) page"""
+    small = im.copy(); small.thumbnail((800, 800))
+    px = np.asarray(small)
+    ink_at = px.mean() - 40
+    if (px < ink_at).mean() < 0.002: return 0.0   # blank page
+    best, best_score = 0.0, -1.0
+    for angle in np.arange(-MAX_SKEW, MAX_SKEW + SKEW_STEP / 2, SKEW_STEP):
+        rows = (np.asarray(small.rotate(float(angle), fillcolor=255)) < ink_at).sum(axis=1)
+        score = float(np.var(rows))
+        if score > best_score: best, best_score = float(angle), score
+    return best
+
+def preprocess(im: Image.Image) -> Image.Image:
+    """Camera orientation, grayscale, downscale to MAX_SIDE, deskew"""
+    im = ImageOps.exif_transpose(im).convert("L")
+    if max(im.size) > MAX_SIDE:
+        im.thumbnail((MAX_SIDE, MAX_SIDE), Image.LANCZOS)
+    angle = deskew_angle(im)
+    if angle:
+        im = im.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    return im
+
+def _ocr(path: str, prep: bool) -> str:
+    with Image.open(path) as im:
+        return pytesseract.image_to_string(preprocess(im) if prep else im)
+
+def image_to_text(path: str, prep: bool = True) -> str:
     try:
-        im = Image.open(path)
-        return pytesseract.image_to_string(im)
+        return cached_text(path, ocr_extractor(prep), lambda: _ocr(path, prep))
     except Exception:
         return ""
 
 def image_to_dishes(path: str, cuisine_hint=None):
     txt = image_to_text(path)
     return text_to_dishes(txt, meal_hint=None, cuisine_hint=cuisine_hint)
+
+def list_images(directory: str, recursive: bool = False) -> List[str]:
+    root = Path(directory)
+    found = root.rglob("*") if recursive else root.iterdir()
+    return sorted(str(p) for p in found if p.is_file() and p.suffix.lower() in IMAGE_EXTS)
+
+class OcrStats:
+    """Running counters for a batch OCR ingest; pages_per_minute covers wall time since start"""
+    def __init__(self):
+        self.pages = 0; self.empty = 0; self.started = time.perf_counter()
+
+    @property
+    def pages_per_minute(self) -> float:
+        return self.pages * 60 / max(time.perf_counter() - self.started, 1e-9)
+
+def iter_image_texts(paths: Iterable[str], workers: Optional[int] = None,
+                     stats: Optional[OcrStats] = None) -> Iterator[Tuple[str, str]]:
+    """(path, text) per image, in input order, with OCR spread across a process pool"""
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        results = ((p, image_to_text(p)) for p in paths)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = zip(paths, pool.map(image_to_text, paths))
+    try:
+        for path, text in results:
+            if stats:
+                stats.pages += 1; stats.empty += not text.strip()
+            yield path, text
+    finally:
+        if workers > 1: pool.shutdown(cancel_futures=True)
+
+def iter_image_dishes(paths: Iterable[str], cuisine_hint=None, workers: Optional[int] = None,
+                      stats: Optional[OcrStats] = None):
+    """image iterator -> OCR text -> line iterator -> dish iterator, ready for write_dishes_stream"""
+    texts = (text for _, text in iter_image_texts(paths, workers, stats))
+    return iter_dishes(iter_lines(texts), None, cuisine_hint)
@@ -1,13 +1,54 @@
 import pdfplumber
-from .normalize import text_to_dishes
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+from .normalize import iter_dishes, iter_lines
+from .text_cache import cached_pages
 
-def pdf_to_text(path: str) -> str:
-    parts=[]
+EXTRACTOR = f"pdfplumber {pdfplumber.__version__} r1"   # bump r when page text post-processing changes
+
+def _page_text(p) -> str:
+    t = p.extract_text() or ""
+    p.close()   # drop the page's parsed objects; pdf.pages would otherwise keep them all
+    return t
+
+def _extract_range(job: Tuple[str, int, int]) -> List[str]:
+    """Worker: text of pages [start, stop) of one PDF"""
+    path, start, stop = job
+    with pdfplumber.open(path) as pdf:
+        return [_page_text(pdf.pages[i]) for i in range(start, stop)]
+
+def page_count(path: str) -> int:
     with pdfplumber.open(path) as pdf:
-        for p in pdf.pages:
-            t = p.extract_text() or ""
-            if t.strip(): parts.append(t)
-    return "\n".join(parts)
+        return len(pdf.pages)
+
+def iter_pdf_pages(path: str, workers: int = 1) -> Iterator[str]:
+    """Text of each non-empty page, in page order, served from the text cache when this file was
+    extracted before"""
+    return cached_pages(path, EXTRACTOR, lambda: _extract_pages(path, workers))
+
+def _extract_pages(path: str, workers: int) -> Iterator[str]:
+    """With workers > 1, page ranges are extracted in a process pool (a few ranges per worker so
+    stragglers even out) and yielded as they complete in order"""
+    if workers <= 1:
+        with pdfplumber.open(path) as pdf:
+            for p in pdf.pages:
+                t = _page_text(p)
+                if t.strip(): yield t
+        return
+    n = page_count(path)
+    step = max(1, -(-n // (workers * 4)))
+    jobs = [(path, a, min(a + step, n)) for a in range(0, n, step)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for texts in pool.map(_extract_range, jobs):
+            for t in texts:
+                if t.strip(): yield t
+
+def pdf_to_text(path: str, workers: int = 1) -> str:
+    return "\n".join(iter_pdf_pages(path, workers))
+
+def iter_pdf_dishes(path: str, meal_hint=None, cuisine_hint=None, workers: int = 1):
+    """page iterator -> line iterator -> dish iterator"""
+    return iter_dishes(iter_lines(iter_pdf_pages(path, workers)), meal_hint, cuisine_hint)
 
-def pdf_to_dishes(path: str, meal_hint=None, cuisine_hint=None):
-    return text_to_dishes(pdf_to_text(path), meal_hint, cuisine_hint)
+def pdf_to_dishes(path: str, meal_hint=None, cuisine_hint=None, workers: int = 1):
+    return list(iter_pdf_dishes(path, meal_hint, cuisine_hint, workers))
@@ -1,12 +1,30 @@
+import asyncio, queue, threading, time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 import httpx
 from bs4 import BeautifulSoup
 from readability import Document
 from .normalize import text_to_dishes
+from .recipe_jsonld import recipes_from_html
 
-async def extract_text_from_url(url: str) -> str:
-    async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
-        r = await client.get(url); r.raise_for_status()
-        html = r.text
+try:
+    import h2  # noqa: F401  (httpx negotiates HTTP/2 only when the h2 package is present)
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+CONCURRENCY = 32   # requests in flight across all hosts
+PER_HOST = 4       # requests in flight per host, to stay polite to any one site
+HANDOFF = 64       # parsed pages waiting for the writer before parsing (and so fetching) pauses
+
+def make_client(concurrency: int = CONCURRENCY) -> httpx.AsyncClient:
+    """One pooled client for a whole batch: connections (and TLS sessions) are reused per host"""
+    return httpx.AsyncClient(timeout=20.0, follow_redirects=True, http2=HTTP2,
+                             limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency))
+
+def html_to_text(html: str) -> str:
     try:
         doc = Document(html); content_html = doc.summary()
         soup = BeautifulSoup(content_html, "lxml")
@@ -15,6 +33,130 @@ async def extract_text_from_url(url: str) -> str:
         soup = BeautifulSoup(html, "lxml")
         return soup.get_text("\n", strip=True)
 
+async def fetch_html(url: str, client: Optional[httpx.AsyncClient] = None) -> str:
+    if client is None:
+        async with make_client() as client:
+            return await fetch_html(url, client)
+    r = await client.get(url); r.raise_for_status()
+    return r.text
+
+async def extract_text_from_url(url: str, client: Optional[httpx.AsyncClient] = None) -> str:
+    return html_to_text(await fetch_html(url, client))
+
+def html_to_dishes(html: str, meal_hint=None, cuisine_hint=None, url: Optional[str] = None) -> Tuple[list, bool]:
+    """(dishes, structured): schema.org Recipe JSON-LD when the page embeds it, else page text"""
+    dishes = recipes_from_html(html, meal_hint, cuisine_hint, url)
+    if dishes: return dishes, True
+    return text_to_dishes(html_to_text(html), meal_hint, cuisine_hint), False
+
 async def url_to_dishes(url: str, meal_hint=None, cuisine_hint=None):
-    txt = await extract_text_from_url(url)
-    return text_to_dishes(txt, meal_hint, cuisine_hint)
+    return html_to_dishes(await fetch_html(url), meal_hint, cuisine_hint, url)[0]
+
+def read_url_list(path: str) -> List[str]:
+    """URLs from a text file, one per line; blank lines, # comments and repeats are skipped"""
+    with open(path, encoding="utf-8") as f:
+        urls = [l.strip() for l in f]
+    return list(dict.fromkeys(u for u in urls if u and not u.startswith("#")))
+
+class UrlStats:
+    """Running counters for a batch URL ingest; rates cover wall time since start"""
+    def __init__(self):
+        self.urls = 0; self.failed = 0; self.bytes = 0; self.structured = 0; self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.perf_counter() - self.started, 1e-9)
+
+    @property
+    def urls_per_minute(self) -> float:
+        return (self.urls + self.failed) * 60 / self.elapsed
+
+    @property
+    def jsonld_hit_rate(self) -> float:
+        """Share of fetched pages parsed from Recipe JSON-LD rather than page text"""
+        return self.structured / self.urls if self.urls else 0.0
+
+async def _fetch_all(urls: List[str], parse: Callable[[str, str], Tuple[list, bool]], emit: Callable[[list], None],
+                     concurrency: int, per_host: int, parse_workers: int, stats: UrlStats):
+    total = asyncio.Semaphore(concurrency)
+    hosts = defaultdict(lambda: asyncio.Semaphore(per_host))
+    loop = asyncio.get_running_loop()
+
+    def parse_and_emit(url, html):
+        dishes, structured = parse(url, html)
+        emit(dishes)   # blocks on a full handoff, holding this worker until the writer catches up
+        return structured
+
+    async def one(client, pool, url):
+        # a bad URL, a failed fetch or a page the parser chokes on costs that URL only, not the batch
+        try:
+            # host slot first, so a busy host doesn't hold global slots other hosts could use
+            async with hosts[urlsplit(url).netloc]:
+                await total.acquire()
+                try:
+                    html = await fetch_html(url, client)
+                except BaseException:
+                    total.release(); raise
+            # the global slot stays held until the page is handed off: at most `concurrency` pages
+            # are in hand, and a stalled writer stops new fetches
+            try:
+                # JSON-LD/readability/BeautifulSoup parsing is CPU-bound; keep it off the event loop
+                structured = await loop.run_in_executor(pool, parse_and_emit, url, html)
+            finally:
+                total.release()
+            stats.urls += 1; stats.bytes += len(html); stats.structured += structured
+        except Exception:
+            stats.failed += 1
+
+    with ThreadPoolExecutor(max_workers=parse_workers) as pool:
+        async with make_client(concurrency) as client:
+            await asyncio.gather(*(one(client, pool, u) for u in urls))
+
+def iter_url_dishes(urls: Iterable[str], meal_hint=None, cuisine_hint=None, concurrency: int = CONCURRENCY,
+                    per_host: int = PER_HOST, parse_workers: int = 4, stats: Optional[UrlStats] = None) -> Iterator:
+    """Dishes from many URLs as pages arrive (completion order), ready for write_dishes_stream.
+    Fetching runs on an event loop in a background thread; parsed pages are handed over a bounded queue,
+    so a slow consumer holds back parsing and fetching instead of letting pages pile up. Closing the
+    generator early (break, exception) stops the fetch thread and its parse workers."""
+    stats = stats or UrlStats()
+    parse = lambda url, html: html_to_dishes(html, meal_hint, cuisine_hint, url)
+    handoff: "queue.Queue" = queue.Queue(maxsize=HANDOFF)
+    done = object()
+    stop = threading.Event()
+    running = {}
+
+    def put(item):
+        # never block for good: once the consumer has gone, puts are dropped
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1); return
+            except queue.Full:
+                continue
+
+    async def main():
+        running["loop"], running["task"] = asyncio.get_running_loop(), asyncio.current_task()
+        if stop.is_set(): return
+        await _fetch_all(list(urls), parse, put, concurrency, per_host, parse_workers, stats)
+
+    def run():
+        try:
+            asyncio.run(main())
+        except BaseException as e:
+            put(e)
+        finally:
+            put(done)
+
+    threading.Thread(target=run, name="nigela-fetch", daemon=True).start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is done: return
+            if isinstance(item, BaseException): raise item
+            yield from item
+    finally:
+        stop.set()
+        if "task" in running:
+            try:
+                running["loop"].call_soon_threadsafe(running["task"].cancel)
+            except RuntimeError:
+                pass   # the loop already finished
@@ -0,0 +1,73 @@
+"""
+Persistent Plan Cache for Nigela
+One JSON file per date under data/plans/, keyed by fingerprints of everything a plan reads:
+catalog version, pantry, variants, rotation history and the planner options. suggest, cards and
+email share the stored plan and only recompute when one of those changed.
+"""
+
+import hashlib, json, os
+from datetime import date
+from pathlib import Path
+from typing import Optional
+from .io_xls import open_store, catalog_key
+from .ingest_journal import dish_to_record, record_to_dish
+
+PLANS_DIR = "plans"
+CACHE_FORMAT = 1   # bump when planning rules change so stored plans are recomputed
+
+def _file_hash(path: Path) -> str:
+    if not path.exists(): return "-"
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+def history_fingerprint(data_dir="data") -> str:
+    return _file_hash(Path(data_dir) / "meal_history.json")
+
+def fingerprint(day: date, data_dir="data", **options) -> str:
+    with open_store(f"{data_dir}/dishes.xlsx") as store:
+        catalog = catalog_key(store)
+    parts = {
+        "format": CACHE_FORMAT, "date": day.isoformat(), "catalog": catalog,
+        "pantry": _file_hash(Path(data_dir) / "pantry.xlsx"),
+        "variants": _file_hash(Path(data_dir) / "variants.xlsx"),
+        "history": history_fingerprint(data_dir),
+        "options": options,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+def plan_path(day: date, data_dir="data") -> Path:
+    return Path(data_dir) / PLANS_DIR / f"{day.isoformat()}.json"
+
+def _dish_record(d) -> dict:
+    r = dish_to_record(d)
+    r["variant_adults"], r["variant_kids"] = d.variant_adults, d.variant_kids
+    return r
+
+def _record_dish(r: dict):
+    d = record_to_dish(r)
+    d.variant_adults, d.variant_kids = r.get("variant_adults"), r.get("variant_kids")
+    return d
+
+def load_plan(day: date, key: str, data_dir="data") -> Optional[dict]:
+    """Stored plan for day if it was computed under this fingerprint"""
+    p = plan_path(day, data_dir)
+    try:
+        with open(p, encoding="utf-8") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if doc.get("key") != key: return None
+    return {meal: {slot: _record_dish(r) for slot, r in slots.items()} for meal, slots in doc["plan"].items()}
+
+def save_plan(day: date, key: str, plan: dict, data_dir="data"):
+    p = plan_path(day, data_dir)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    doc = {"key": key, "date": day.isoformat(),
+           "plan": {meal: {slot: _dish_record(d) for slot, d in slots.items()} for meal, slots in plan.items()}}
+    tmp = p.with_name(p.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False)
+    os.replace(tmp, p)
@@ -0,0 +1,100 @@
+"""
+schema.org Recipe JSON-LD for Nigela
+Most recipe sites embed their recipe as <script type="application/ld+json">. Reading it gives the
+real ingredients, quantities, steps and times directly, without readability or the line heuristics
+in normalize, so parse_url tries it first and only falls back to page text when a page has none.
+"""
+
+import html as htmllib, json, re
+from typing import Iterator, List, Optional
+from .models import Dish, Ingredient
+from .normalize import guess_tags
+from .ingredient_parser import parse_ingredient
+
+LD_SCRIPT = re.compile(r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script>", re.I | re.S)
+ISO_DURATION = re.compile(r"^P(?:(\d+(?:\.\d+)?)W)?(?:(\d+(?:\.\d+)?)D)?(?:T(?:(\d+(?:\.\d+)?)H)?(?:(\d+(?:\.\d+)?)M)?(?:(\d+(?:\.\d+)?)S)?)?$", re.I)
+MEALS = ("breakfast", "lunch", "dinner", "snack")
+MAX_MINUTES = 7 * 24 * 60   # fermenting/soaking recipes run to days; anything longer is a typo
+
+def iso_minutes(value) -> Optional[int]:
+    """Minutes in an ISO-8601 duration ("PT1H30M", "P0DT20M"); bare numbers are taken as minutes"""
+    if value is None: return None
+    s = str(value).strip()
+    if re.fullmatch(r"\d+(?:\.\d+)?", s): return round(float(s))
+    m = ISO_DURATION.match(s)
+    if not m or not any(m.groups()): return None
+    w, d, h, mins, secs = (float(g or 0) for g in m.groups())
+    return round(((w * 7 + d) * 24 + h) * 60 + mins + secs / 60)
+
+def ingredient_from_line(line: str) -> Ingredient:
+    """"2 cups rice, rinsed" -> Ingredient("rice", 2, "cup"); unparsed lines keep qty 0"""
+    return parse_ingredient(htmllib.unescape(str(line)))
+
+def _texts(value) -> Iterator[str]:
+    """recipeInstructions: a string, a list of strings, HowToStep objects or HowToSections of them"""
+    if isinstance(value, str):
+        for line in re.split(r"\n+", htmllib.unescape(value)):
+            if line.strip(): yield re.sub(r"<[^>]+>", "", line).strip()
+    elif isinstance(value, list):
+        for v in value: yield from _texts(v)
+    elif isinstance(value, dict):
+        yield from _texts(value.get("itemListElement") or value.get("text") or value.get("name") or "")
+
+def _first(value) -> str:
+    if isinstance(value, list): value = value[0] if value else ""
+    if isinstance(value, dict): value = value.get("name", "")
+    return htmllib.unescape(str(value or "")).strip()
+
+def _is_recipe(obj: dict) -> bool:
+    t = obj.get("@type")
+    return "Recipe" in t if isinstance(t, list) else t == "Recipe"
+
+def find_recipes(obj) -> Iterator[dict]:
+    """Recipe nodes anywhere in a JSON-LD document (top level, lists, @graph, mainEntity)"""
+    if isinstance(obj, list):
+        for v in obj: yield from find_recipes(v)
+    elif isinstance(obj, dict):
+        if _is_recipe(obj):
+            yield obj; return
+        for k in ("@graph", "mainEntity", "mainEntityOfPage", "itemListElement", "item"):
+            if k in obj: yield from find_recipes(obj[k])
+
+def iter_jsonld(html: str) -> Iterator:
+    for block in LD_SCRIPT.findall(html or ""):
+        try:
+            yield json.loads(block.strip(), strict=False)
+        except ValueError:
+            continue   # sites ship broken JSON-LD often enough; the page-text path still runs
+
+def recipe_to_dish(r: dict, meal_hint=None, cuisine_hint=None, url: Optional[str] = None) -> Optional[Dish]:
+    name = _first(r.get("name"))
+    if not name: return None
+    meal = meal_hint
+    if not meal:
+        category = " ".join(_texts(r.get("recipeCategory") or "")).lower()
+        meal = next((m for m in MEALS if m in category), "dinner")
+    cuisine = cuisine_hint or _first(r.get("recipeCuisine")).lower() or None
+    minutes = iso_minutes(r.get("totalTime"))
+    if minutes is None:
+        parts = [iso_minutes(r.get(k)) for k in ("prepTime", "cookTime")]
+        minutes = sum(p for p in parts if p) or None
+    lines = r.get("recipeIngredient") or r.get("ingredients") or []
+    if isinstance(lines, str): lines = [lines]
+    return Dish(
+        name=name, meal_type=meal, tags=guess_tags(name, meal, cuisine),
+        cook_minutes=min(minutes or 20, MAX_MINUTES), difficulty=2,
+        ingredients=[ingredient_from_line(l) for l in lines if str(l).strip()] or [Ingredient("salt", 1, "tsp")],
+        steps=list(_texts(r.get("recipeInstructions"))) or ["Follow recipe link"],
+        flavor_text="Nigela whispers: keep it gentle.", rarity="common",
+        public_url=_first(r.get("url")) or url,
+    )
+
+def recipes_from_html(html: str, meal_hint=None, cuisine_hint=None, url: Optional[str] = None) -> List[Dish]:
+    """Dishes for every schema.org Recipe embedded in the page; [] when there are none"""
+    if "ld+json" not in (html or ""): return []
+    out = []
+    for doc in iter_jsonld(html):
+        for r in find_recipes(doc):
+            d = recipe_to_dish(r, meal_hint, cuisine_hint, url)
+            if d: out.append(d)
+    return out
@@ -0,0 +1,84 @@
+"""
+Fair Rotation Scheduler for Nigela
+Least-recently-used selection over a category's items with a heap keyed by last-used day minus a
+per-item weight (in days; favourites come round sooner). Picks are O(log n), so a category can hold
+thousands of catalog dishes, and over a long horizon every item is served before any repeats.
+"""
+
+import heapq, random
+from datetime import date, datetime
+from typing import Dict, Hashable, Iterable, List, Optional, Union
+
+DayLike = Union[date, datetime, str, int, None]
+NEVER = 0   # ordinal for items that were never served
+
+def day_ordinal(day: DayLike) -> int:
+    if day is None: return NEVER
+    if isinstance(day, int): return day
+    if isinstance(day, str): day = datetime.fromisoformat(day)
+    return day.toordinal()
+
+class RotationScheduler:
+    def __init__(self, items: Iterable[Hashable], last_used: Optional[Dict[Hashable, DayLike]] = None,
+                 weights: Optional[Dict[Hashable, float]] = None, rng: Optional[random.Random] = None):
+        self.weights = weights or {}
+        self.rng = rng or random.Random()
+        last_used = last_used or {}
+        self._last: Dict[Hashable, int] = {}
+        self._heap: List[tuple] = []
+        self.last_gap: Optional[int] = None   # days between the latest pick and that item's previous use
+        for item in items:
+            self._last[item] = day_ordinal(last_used.get(item))
+            self._heap.append(self._entry(item))
+        heapq.heapify(self._heap)
+
+    def _entry(self, item) -> tuple:
+        last = self._last[item]
+        # random tiebreak: items last used on the same day (or never) come out in varied order
+        return (last - self.weights.get(item, 0), self.rng.random(), last, item)
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def _pop_live(self) -> Optional[tuple]:
+        # skip entries superseded by touch()
+        while self._heap:
+            e = heapq.heappop(self._heap)
+            if e[2] == self._last[e[3]]: return e
+        return None
+
+    def pick(self, day: DayLike, min_gap: int = 0) -> Hashable:
+        """Serve the least recently used item on day. With min_gap, pass over items served fewer
+        than min_gap days before day (only a weight can rank one of those first); if every item
+        was, serve the best-ranked one anyway."""
+        if not self._last: raise IndexError("pick from an empty rotation")
+        d = day_ordinal(day)
+        skipped = []
+        entry = self._pop_live()
+        while min_gap and entry is not None and d - entry[2] < min_gap:
+            skipped.append(entry)
+            # keys never exceed last-used days, so past this key nothing can qualify
+            entry = self._pop_live() if entry[0] <= d - min_gap else None
+        if entry is None: entry = skipped.pop(0)
+        for e in skipped: heapq.heappush(self._heap, e)
+        _, _, last, item = entry
+        self.last_gap = d - last if last != NEVER else None
+        self._last[item] = max(last, d)
+        heapq.heappush(self._heap, self._entry(item))
+        return item
+
+    def touch(self, item, day: DayLike):
+        """Record that item was served on day outside pick() (e.g. replayed history)"""
+        if item not in self._last: return
+        d = day_ordinal(day)
+        if d > self._last[item]:
+            self._last[item] = d
+            heapq.heappush(self._heap, self._entry(item))
+
+    def peek(self, n: int = 1) -> List[Hashable]:
+        """The next n items pick() would serve, without serving them"""
+        live = (e for e in self._heap if e[2] == self._last[e[3]])
+        return [e[3] for e in heapq.nsmallest(n, live)]
+
+    def last_used(self, item) -> int:
+        return self._last.get(item, NEVER)
@@ -1,5 +1,12 @@
 from .models import Dish
-from typing import Dict
+from typing import Dict, Iterable, Optional
+import numpy as np
+
+# score() rules; CatalogScorer applies the same weights as a matrix product
+JAIN_BONUS, CUISINE_BONUS, QUICK_BONUS, KID_BONUS = 10.0, 2.0, 3.0, 2.0
+QUICK_MINUTES = 25
+REPEAT_PENALTY = -100.0
+PANTRY_MISS = -999.0
 
 def pantry_ok(d: Dish, stock: Dict[str, dict]) -> bool:
     for i in d.ingredients:
@@ -10,11 +17,66 @@ def pantry_ok(d: Dish, stock: Dict[str, dict]) -> bool:
 
 def score(d: Dish, stock: Dict[str, dict], used_last: set[str]) -> float:
     s = 0.0
-    if not pantry_ok(d, stock): return -999
+    if not pantry_ok(d, stock): return PANTRY_MISS
     tags = set(d.tags or [])
-    if "jain" in tags: s += 10
-    if any(t.startswith("cuisine:") for t in tags): s += 2
-    if d.name.lower() in used_last: s -= 100
-    if d.cook_minutes <= 25: s += 3
-    if "kid-friendly" in tags: s += 2
+    if "jain" in tags: s += JAIN_BONUS
+    if any(t.startswith("cuisine:") for t in tags): s += CUISINE_BONUS
+    if d.name.lower() in used_last: s += REPEAT_PENALTY
+    if d.cook_minutes <= QUICK_MINUTES: s += QUICK_BONUS
+    if "kid-friendly" in tags: s += KID_BONUS
     return s
+
+class CatalogScorer:
+    """score() over a whole CompactCatalog at once. The ingredient CSR arrays act as a sparse
+    dish x ingredient quantity matrix checked against a pantry vector, and the tag rules are a
+    dish x feature matrix times a weight vector; results equal score() dish for dish."""
+
+    WEIGHTS = np.array([JAIN_BONUS, CUISINE_BONUS, QUICK_BONUS, KID_BONUS])
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        n = len(catalog)
+        self.item_keys = [it.lower() for it in catalog.item_vocab]
+        self.ing_dish = np.repeat(np.arange(n), np.diff(catalog.ing_ptr))
+
+        tag_dish = np.repeat(np.arange(n), np.diff(catalog.tag_ptr))
+        def has(flags) -> np.ndarray:
+            flags = np.asarray(flags, dtype=bool)
+            return np.bincount(tag_dish, weights=flags[catalog.tag_ids], minlength=n) > 0 if n else np.zeros(0, bool)
+        vocab = catalog.tag_vocab
+        features = np.column_stack([
+            has([t == "jain" for t in vocab]),
+            has([t.startswith("cuisine:") for t in vocab]),
+            catalog.cook_minutes <= QUICK_MINUTES,
+            has([t == "kid-friendly" for t in vocab]),
+        ]).astype(np.float64)
+        self.base = features @ self.WEIGHTS
+
+        self.name_ids: Dict[str, list] = {}
+        for i, name in enumerate(catalog.names.to_pylist()):
+            self.name_ids.setdefault(name.lower(), []).append(i)
+
+    def stock_vector(self, stock: Dict[str, dict]) -> np.ndarray:
+        """Quantity on hand per catalog ingredient; unnamed ingredients always fit"""
+        return np.array([stock.get(k, {"qty": 0})["qty"] if k else np.inf for k in self.item_keys], dtype=np.float64)
+
+    def pantry_ok(self, stock: Dict[str, dict]) -> np.ndarray:
+        """pantry_ok() for every dish in the catalog"""
+        short = self.stock_vector(stock)[self.catalog.ing_item] < self.catalog.ing_qty
+        return np.bincount(self.ing_dish[short], minlength=len(self.catalog)) == 0
+
+    def used_mask(self, used_last: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(len(self.catalog), dtype=bool)
+        for name in used_last:
+            mask[self.name_ids.get(name, [])] = True
+        return mask
+
+    def scores(self, ids, ok: np.ndarray, used: np.ndarray) -> np.ndarray:
+        """Scores of dishes ids, given pantry_ok() and used_mask() arrays for the catalog"""
+        ids = np.asarray(ids, dtype=np.int64)
+        return np.where(ok[ids], self.base[ids] + REPEAT_PENALTY * used[ids], PANTRY_MISS)
+
+    def best(self, ids, ok: np.ndarray, used: np.ndarray) -> Optional[int]:
+        """Catalog id of the top scorer among ids (first one on ties), or None if ids is empty"""
+        if not len(ids): return None
+        return int(ids[int(np.argmax(self.scores(ids, ok, used)))])
@@ -1,47 +1,128 @@
-from datetime import date
-from typing import Dict, List, Optional, Union
-from .io_xls import read_pantry, read_dishes, read_slots, read_variants
-from .scoring import score
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from .io_xls import read_pantry, read_slots, read_variants
+from .tag_index import TagIndex, load_indexed_catalog
+from .compact_catalog import CompactCatalog
+from .scoring import CatalogScorer, score
+from .day_optimizer import optimize_slots
+from .plan_cache import fingerprint, load_plan, save_plan
 from .models import Dish
 
+# Enhanced 5-meal plan structure
+MEAL_STRUCTURE = {
+    'breakfast': ['main_starch', 'protein', 'yogurt', 'fruit'],
+    'morning_snack': ['fruit', 'nuts', 'beverage'],
+    'lunch': ['salad', 'dal', 'rice', 'roti', 'vegetable', 'farsan'],
+    'evening_snack': ['farsan', 'tea', 'light_bite'],
+    'dinner': ['soup', 'khichdi', 'bread', 'vegetable_west', 'protein_farsan', 'digestif']
+}
+
+@dataclass
+class PlanData:
+    """Pantry, catalog and variants read once and shared by every day of a plan"""
+    stock: Dict[str, dict]
+    catalog: CompactCatalog
+    index: TagIndex
+    slots: Dict[str, List[str]]
+    variants: Dict[Tuple[str, str], str]
+    _cands: Dict[Tuple[str, str], np.ndarray] = field(default_factory=dict, repr=False)
+    _scorer: Optional[CatalogScorer] = field(default=None, repr=False)
+
+    @property
+    def scorer(self) -> CatalogScorer:
+        if self._scorer is None:
+            self._scorer = CatalogScorer(self.catalog)
+        return self._scorer
+
+    def candidates(self, meal: str, slot: str) -> np.ndarray:
+        """Catalog ids of the dishes for a meal slot"""
+        key = (meal, slot)
+        if key not in self._cands:
+            # Look for dishes with appropriate tags (inverted index, built once per catalog version)
+            ids = self.index.ids_for(f"{meal.replace('_snack', '')}:{slot}")
+
+            # If no specific matches, broaden search
+            if not len(ids) and meal.endswith('_snack'):
+                ids = self.index.ids_matching(slot)
+            self._cands[key] = ids
+        return self._cands[key]
+
+def load_plan_data(data_dir="data") -> PlanData:
+    catalog, index = load_indexed_catalog(f"{data_dir}/dishes.xlsx")
+    return PlanData(stock=read_pantry(f"{data_dir}/pantry.xlsx"), catalog=catalog, index=index,
+                    slots=read_slots(f"{data_dir}/slots.xlsx"), variants=read_variants(f"{data_dir}/variants.xlsx"))
+
 def pick_for_slot(cands: List[Dish], stock: Dict, used_last: set[str]) -> Optional[Dish]:
     if not cands: return None
-    ranked = sorted(cands, key=lambda d: score(d, stock, used_last), reverse=True)
-    return ranked[0] if ranked else None
-
-def suggest_for_day(day: date, data_dir="data") -> dict:
-    stock = read_pantry(f"{data_dir}/pantry.xlsx")
-    dishes = read_dishes(f"{data_dir}/dishes.xlsx")
-    slots = read_slots(f"{data_dir}/slots.xlsx")
-    variants = read_variants(f"{data_dir}/variants.xlsx")
-
-    # Enhanced 5-meal plan structure
-    meal_structure = {
-        'breakfast': ['main_starch', 'protein', 'yogurt', 'fruit'],
-        'morning_snack': ['fruit', 'nuts', 'beverage'],
-        'lunch': ['salad', 'dal', 'rice', 'roti', 'vegetable', 'farsan'],
-        'evening_snack': ['farsan', 'tea', 'light_bite'],
-        'dinner': ['soup', 'khichdi', 'bread', 'vegetable_west', 'protein_farsan', 'digestif']
-    }
+    # max keeps the first of equal scores, same as the stable reverse sort it replaces
+    return max(cands, key=lambda d: score(d, stock, used_last))
 
+def plan_day(data: PlanData, stock: Dict, used_names: set[str], optimize: bool = False,
+             budget_ms: int = 200, max_cook_minutes: Optional[int] = None) -> dict:
+    """One day's plan against the given stock; picked names are added to used_names.
+    Candidates are scored in one shot by the catalog scorer, and only the picks become Dishes.
+    With optimize, all slots are chosen jointly (see day_optimizer) within budget_ms."""
+    scorer = data.scorer
+    if optimize:
+        slots = [((meal, slot), data.candidates(meal, slot)) for meal, slot_list in MEAL_STRUCTURE.items() for slot in slot_list]
+        picks, _ = optimize_slots(scorer, slots, stock, used_names, budget_ms, max_cook_minutes)
+    else:
+        ok, used = scorer.pantry_ok(stock), scorer.used_mask(used_names)
     out = {}
-    used_names = set()
-    
-    for meal, slot_list in meal_structure.items():
+    for meal, slot_list in MEAL_STRUCTURE.items():
         out[meal] = {}
         for slot in slot_list:
-            # Look for dishes with appropriate tags
-            cands = [d for d in dishes if any(t == f"{meal.replace('_snack', '')}:{slot}" for t in d.tags)]
-            
-            # If no specific matches, broaden search
-            if not cands and meal.endswith('_snack'):
-                cands = [d for d in dishes if any(slot in t for t in d.tags)]
-            
-            pick = pick_for_slot(cands, stock, used_names)
-            if pick:
+            best = picks.get((meal, slot)) if optimize else scorer.best(data.candidates(meal, slot), ok, used)
+            if best is not None:
+                pick = data.catalog.dish(best)
                 used_names.add(pick.name.lower())
-                pick.variant_adults = variants.get(("adult", slot))
-                pick.variant_kids   = variants.get(("kids", slot))
+                if not optimize: used |= scorer.used_mask([pick.name.lower()])
+                pick.variant_adults = data.variants.get(("adult", slot))
+                pick.variant_kids   = data.variants.get(("kids", slot))
                 out[meal][slot] = pick
-    
     return out
+
+def deplete(stock: Dict[str, dict], plan: dict):
+    """Take a day's ingredients out of the pantry (never below zero)"""
+    for slots in plan.values():
+        for d in slots.values():
+            for i in d.ingredients:
+                have = stock.get((i.item or "").lower())
+                if have: have["qty"] = max(0.0, have["qty"] - (i.qty or 0))
+
+def suggest_for_day(day: date, data_dir="data", data: Optional[PlanData] = None, optimize: bool = False,
+                    budget_ms: int = 200, max_cook_minutes: Optional[int] = None, cache: bool = True) -> dict:
+    """Plan for one day. Unless data is passed in, the plan is stored under data/plans/ and reused
+    while the catalog, pantry, variants and rotation history are unchanged."""
+    if data is not None or not cache:
+        data = data or load_plan_data(data_dir)
+        return plan_day(data, data.stock, set(), optimize, budget_ms, max_cook_minutes)
+    key = fingerprint(day, data_dir, optimize=optimize, budget_ms=budget_ms if optimize else None,
+                      max_cook_minutes=max_cook_minutes if optimize else None)
+    plan = load_plan(day, key, data_dir)
+    if plan is None:
+        data = load_plan_data(data_dir)
+        plan = plan_day(data, data.stock, set(), optimize, budget_ms, max_cook_minutes)
+        save_plan(day, key, plan, data_dir)
+    return plan
+
+def suggest_for_range(start: date, days: int, data_dir="data", data: Optional[PlanData] = None,
+                      no_repeat_days: int = 1, optimize: bool = False, budget_ms: int = 200,
+                      max_cook_minutes: Optional[int] = None) -> Dict[date, dict]:
+    """Plans for `days` consecutive days from start, loading everything once. The pantry is
+    depleted by each day's picks, and dishes served in the previous `no_repeat_days` days are
+    penalized the same way repeats within a day are. The first day matches suggest_for_day."""
+    data = data or load_plan_data(data_dir)
+    stock = {k: dict(v) for k, v in data.stock.items()}
+    recent = deque(maxlen=max(no_repeat_days, 0))
+    plans = {}
+    for k in range(days):
+        day = start + timedelta(days=k)
+        used_names = set().union(*recent)
+        plans[day] = plan_day(data, stock, used_names, optimize, budget_ms, max_cook_minutes)
+        recent.append({d.name.lower() for slots in plans[day].values() for d in slots.values()})
+        deplete(stock, plans[day])
+    return plans
@@ -0,0 +1,83 @@
+"""
+Inverted Tag Index for Nigela
+tag -> sorted dish ids over a CompactCatalog, built once per catalog version, kept in memory for the
+process and saved next to the catalog so later commands skip the build
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import numpy as np
+from .compact_catalog import CompactCatalog
+from .io_xls import open_store, catalog_key, catalog_table
+
+INDEX_FILE = "dishes.tagindex.npz"
+
+class TagIndex:
+    __slots__ = ("vocab", "tag_index", "ptr", "postings", "_fragments")
+
+    def __init__(self, vocab, ptr: np.ndarray, postings: np.ndarray):
+        self.vocab = list(vocab)
+        self.tag_index = {t: k for k, t in enumerate(self.vocab)}
+        self.ptr = ptr
+        self.postings = postings
+        self._fragments: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def build(cls, catalog: CompactCatalog) -> "TagIndex":
+        n, v = len(catalog), len(catalog.tag_vocab)
+        dish_of = np.repeat(np.arange(n, dtype=np.int64), np.diff(catalog.tag_ptr))
+        # one (tag, dish) pair per posting, even if a dish repeats a tag; sorted by tag then dish
+        pairs = np.unique(catalog.tag_ids.astype(np.int64) * max(n, 1) + dish_of)
+        tags, dishes = pairs // max(n, 1), (pairs % max(n, 1)).astype(np.int32)
+        ptr = np.concatenate([[0], np.cumsum(np.bincount(tags, minlength=v))]).astype(np.int64)
+        return cls(catalog.tag_vocab, ptr, dishes)
+
+    def ids_for(self, tag: str) -> np.ndarray:
+        """Dish ids carrying exactly this tag, in catalog order"""
+        t = self.tag_index.get(tag)
+        return self.postings[self.ptr[t]:self.ptr[t+1]] if t is not None else self.postings[:0]
+
+    def ids_matching(self, fragment: str) -> np.ndarray:
+        """Dish ids with any tag containing fragment. Resolved against the tag vocabulary (hundreds
+        of strings) instead of every dish's tags, and memoized per fragment."""
+        hit = self._fragments.get(fragment)
+        if hit is None:
+            parts = [self.ids_for(t) for t in self.vocab if fragment in t]
+            hit = np.unique(np.concatenate(parts)) if parts else self.postings[:0]
+            self._fragments[fragment] = hit
+        return hit
+
+    def save(self, path, key: str):
+        tmp = Path(path).with_name(Path(path).name + ".tmp.npz")
+        np.savez(tmp, key=np.array(key), vocab=np.array(json.dumps(self.vocab)), ptr=self.ptr, postings=self.postings)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path, key: str) -> Optional["TagIndex"]:
+        """Saved index if it was built for this catalog version, else None"""
+        try:
+            with np.load(path) as z:
+                if str(z["key"]) != key: return None
+                return cls(json.loads(str(z["vocab"])), z["ptr"], z["postings"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+_LOADED: Dict[str, Tuple[str, CompactCatalog, TagIndex]] = {}
+
+def load_indexed_catalog(path) -> Tuple[CompactCatalog, TagIndex]:
+    """CompactCatalog + TagIndex for the catalog at path, reused while the catalog key holds"""
+    resolved = str(Path(path).resolve())
+    with open_store(path) as store:
+        key = catalog_key(store)
+        hit = _LOADED.get(resolved)
+        if hit and hit[0] == key:
+            return hit[1], hit[2]
+        catalog = CompactCatalog.from_table(catalog_table(store, path))
+    index_path = Path(path).with_name(INDEX_FILE)
+    index = TagIndex.load(index_path, key)
+    if index is None or len(index.vocab) != len(catalog.tag_vocab):
+        index = TagIndex.build(catalog)
+        index.save(index_path, key)
+    _LOADED[resolved] = (key, catalog, index)
+    return catalog, index
@@ -0,0 +1,123 @@
+"""
+Content-addressed Text Cache for Nigela
+Per-page text from PDF extraction and OCR, stored gzip-compressed under data/text_cache/ and keyed
+by the source file's SHA-256 plus the extractor version, so re-ingesting a library (or the same book
+through ebooks-ingest and batch make-jsonl) skips pdfplumber/tesseract. Renamed or copied files
+still hit; upgrading an extractor misses and the old entries age out via prune.
+"""
+
+import gzip, hashlib, json, os, time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .config import TEXT_CACHE_DIR
+
+SUFFIX = ".jsonl.gz"
+_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+
+def cache_dir() -> Optional[Path]:
+    return Path(TEXT_CACHE_DIR) if TEXT_CACHE_DIR else None
+
+def file_sha256(path) -> str:
+    """Content hash, memoized per (path, mtime, size) for the life of the process"""
+    st = os.stat(path)
+    memo = (str(Path(path).resolve()), st.st_mtime_ns, st.st_size)
+    digest = _DIGESTS.get(memo)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = _DIGESTS[memo] = h.hexdigest()
+    return digest
+
+def entry_path(digest: str, extractor: str, root: Path) -> Path:
+    tag = hashlib.sha256(extractor.encode()).hexdigest()[:12]
+    return root / digest[:2] / f"{digest}.{tag}{SUFFIX}"
+
+def _read_entry(p: Path) -> Optional[List[str]]:
+    """Pages of a stored entry (the first line is a header naming the source and extractor)"""
+    try:
+        with gzip.open(p, "rt", encoding="utf-8") as f:
+            f.readline()
+            return [json.loads(line) for line in f]
+    except (OSError, EOFError, ValueError):
+        return None
+
+def _header(p: Path) -> dict:
+    with gzip.open(p, "rt", encoding="utf-8") as f:
+        return json.loads(f.readline())
+
+def cached_pages(path, extractor: str, extract: Callable[[], Iterable[str]]) -> Iterator[str]:
+    """Pages of path from the cache, or from extract() while writing them through to it. The entry
+    is only published once extract() runs to completion, so an interrupted ingest leaves no partial text."""
+    root = cache_dir()
+    if root is None:
+        yield from extract(); return
+    p = entry_path(file_sha256(path), extractor, root)
+    pages = _read_entry(p) if p.exists() else None
+    if pages is not None:
+        os.utime(p)   # last use, for prune
+        yield from pages; return
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+    try:
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(json.dumps({"source": Path(path).name, "extractor": extractor}) + "\n")
+            for page in extract():
+                f.write(json.dumps(page, ensure_ascii=False) + "\n")
+                yield page
+        os.replace(tmp, p)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def cached_text(path, extractor: str, extract: Callable[[], str]) -> str:
+    """Single-page form for extractors that return one string (OCR)"""
+    return "\n".join(cached_pages(path, extractor, lambda: [extract()]))
+
+def _entries(root: Path) -> List[Path]:
+    return list(root.glob(f"*/*{SUFFIX}")) if root.exists() else []
+
+def stats() -> dict:
+    root = cache_dir()
+    out = {"dir": str(root), "entries": 0, "bytes": 0, "pages": 0, "extractors": {}}
+    if root is None: return out
+    for p in _entries(root):
+        pages = _read_entry(p)
+        if pages is None: continue
+        size = p.stat().st_size
+        out["entries"] += 1; out["bytes"] += size; out["pages"] += len(pages)
+        ex = out["extractors"].setdefault(_header(p).get("extractor", "?"), {"entries": 0, "bytes": 0})
+        ex["entries"] += 1; ex["bytes"] += size
+    return out
+
+def prune(older_than_days: Optional[float] = None, max_bytes: Optional[int] = None,
+          keep_extractors: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+    """Drop unreadable entries, entries unused for older_than_days and (when keep_extractors is
+    given) entries written by any other extractor version, then least recently used entries until
+    the cache fits in max_bytes. Returns (entries, bytes) removed."""
+    root = cache_dir()
+    if root is None or not root.exists(): return 0, 0
+    keep = set(keep_extractors) if keep_extractors is not None else None
+    now = time.time()
+    for t in root.glob("*/*.tmp"):
+        if now - t.stat().st_mtime > 3600: t.unlink(missing_ok=True)   # left by a killed ingest
+    live, removed, freed = [], 0, 0
+    for p in _entries(root):
+        st = p.stat()
+        try: extractor = _header(p).get("extractor")
+        except (OSError, EOFError, ValueError): extractor = None
+        drop = (extractor is None
+                or (older_than_days is not None and now - st.st_mtime > older_than_days * 86400)
+                or (keep is not None and extractor not in keep))
+        if drop:
+            p.unlink(missing_ok=True); removed += 1; freed += st.st_size
+        else:
+            live.append((st.st_mtime, st.st_size, p))
+    if max_bytes is not None:
+        total = sum(size for _, size, _ in live)
+        for _, size, p in sorted(live, key=lambda e: e[0]):
+            if total <= max_bytes: break
+            p.unlink(missing_ok=True); removed += 1; freed += size; total -= size
+    for shard in root.iterdir():
+        if shard.is_dir() and not any(shard.iterdir()): shard.rmdir()
+    return removed, freed
@@ -5,6 +5,7 @@ Features channels like Happy Pear, Ranveer Brar, Tarla Dalal, Satvic Movement
 
 import urllib.parse
 from typing import Dict, List, Optional
+from . import keyword_matcher
 
 # Curated YouTube channels for quality recipe content
 PREMIUM_YOUTUBE_CHANNELS = {
@@ -101,11 +102,17 @@ PREMIUM_YOUTUBE_CHANNELS = {
     }
 }
 
+# Words the channel scorer tests for: every specialty plus the preference triggers below
+PREFERENCE_WORDS = ['vegan', 'plant', 'gujarati', 'thepla', 'dhokla', 'south', 'dosa', 'idli', 'sambhar', 'rasam',
+                    'healthy', 'quinoa', 'superfood']
+keyword_matcher.register("channel", {w: [w] for c in PREMIUM_YOUTUBE_CHANNELS.values() for w in c['specialties'] + PREFERENCE_WORDS})
+
 def select_best_youtube_channel(recipe_name: str, cuisine_hint: str = None, cooking_style: str = None) -> Dict:
     """Select the best YouTube channel for a specific recipe"""
     
-    recipe_lower = recipe_name.lower()
-    cuisine_lower = (cuisine_hint or '').lower()
+    # every keyword present in the name / cuisine, found in one pass each
+    in_recipe = keyword_matcher.match(recipe_name.lower()).get("channel", set())
+    in_cuisine = keyword_matcher.match((cuisine_hint or '').lower()).get("channel", set())
     
     # Channel matching logic
     channel_scores = {}
@@ -116,29 +123,29 @@ def select_best_youtube_channel(recipe_name: str, cuisine_hint: str = None, cook
         
         # Recipe name matching
         for specialty in specialties:
-            if specialty in recipe_lower:
+            if specialty in in_recipe:
                 score += 3
         
         # Cuisine matching
         if cuisine_hint:
             for specialty in specialties:
-                if specialty in cuisine_lower:
+                if specialty in in_cuisine:
                     score += 2
         
         # Special preferences
-        if 'vegan' in recipe_lower or 'plant' in recipe_lower:
+        if 'vegan' in in_recipe or 'plant' in in_recipe:
             if 'vegan' in specialties:
                 score += 5
         
-        if 'gujarati' in recipe_lower or 'thepla' in recipe_lower or 'dhokla' in recipe_lower:
+        if 'gujarati' in in_recipe or 'thepla' in in_recipe or 'dhokla' in in_recipe:
             if 'gujarati' in specialties:
                 score += 5
         
-        if 'south' in cuisine_lower or any(word in recipe_lower for word in ['dosa', 'idli', 'sambhar', 'rasam']):
+        if 'south' in in_cuisine or in_recipe & {'dosa', 'idli', 'sambhar', 'rasam'}:
             if 'south_indian' in specialties:
                 score += 5
         
-        if 'healthy' in recipe_lower or 'quinoa' in recipe_lower or 'superfood' in recipe_lower:
+        if 'healthy' in in_recipe or 'quinoa' in in_recipe or 'superfood' in in_recipe:
             if 'healthy' in specialties or 'satvik' in specialties:
                 score += 4
         